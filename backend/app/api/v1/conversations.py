@@ -9,7 +9,6 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
-import json
 import logging
 import secrets
 import shutil
@@ -26,9 +25,9 @@ from app.schemas.conversation import (
     ConversationDetailResponse,
     ConversationListResponse,
     ExportConversationResponse,
-    MessageResponse,
 )
 from app.utils.openai_helper import generate_title_for_conversation
+from app.utils.responses import ModelJSONResponse
 from app.models.message import Message
 from app.config import settings
 from app.services.cache.paper_store import build_paper_paths, ensure_paper_dir, load_meta, save_meta
@@ -130,18 +129,9 @@ async def get_conversations(
     result = []
     for conv in conversations:
         message_count = await conversation_crud.get_message_count(db, conv.id)
-        conv_dict = {
-            "id": conv.id,
-            "tool_id": conv.tool_id,
-            "title": conv.title,
-            "extra": conv.extra,
-            "created_at": conv.created_at,
-            "updated_at": conv.updated_at,
-            "message_count": message_count,
-        }
-        result.append(ConversationResponse(**conv_dict))
+        result.append(ConversationResponse.from_orm_fast(conv, message_count=message_count))
     
-    return {"conversations": result}
+    return ModelJSONResponse(ConversationListResponse.model_construct(conversations=result))
 
 
 @router.get("/conversations/{conversation_id}", response_model=ConversationDetailResponse)
@@ -154,51 +144,8 @@ async def get_conversation(
     if not conversation:
         raise HTTPException(status_code=404, detail="会话不存在")
 
-    # 构建响应
-    messages = []
-    for msg in conversation.messages:
-        # 解析图片JSON
-        images = None
-        if msg.images:
-            try:
-                images = json.loads(msg.images)
-            except (json.JSONDecodeError, TypeError):
-                images = None
-        
-        retry_versions = None
-        if msg.retry_versions:
-            try:
-                retry_versions = json.loads(msg.retry_versions)
-            except (json.JSONDecodeError, TypeError):
-                retry_versions = None
-
-        messages.append(
-            MessageResponse(
-                id=msg.id,
-                conversation_id=msg.conversation_id,
-                role=msg.role,
-                content=msg.content,
-                images=images,
-                retry_versions=retry_versions,
-                cost_meta=msg.cost_meta,
-                thinking=msg.thinking,
-                extra=msg.extra,
-                created_at=msg.created_at
-            )
-        )
-    
-    message_count = len(messages)
-    
-    return ConversationDetailResponse(
-        id=conversation.id,
-        tool_id=conversation.tool_id,
-        title=conversation.title,
-        extra=conversation.extra,
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
-        message_count=message_count,
-        messages=messages,
-    )
+    # 构建响应（行由本服务写入，跳过逐字段校验）
+    return ModelJSONResponse(ConversationDetailResponse.from_orm_fast(conversation))
 
 
 @router.post("/conversations", response_model=ConversationResponse, status_code=201)
@@ -217,15 +164,7 @@ async def create_conversation(
     # 使用 chat_db 创建会话
     conversation = await conversation_crud.create(chat_db, conversation_in)
     
-    return ConversationResponse(
-        id=conversation.id,
-        tool_id=conversation.tool_id,
-        title=conversation.title,
-        extra=conversation.extra,
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
-        message_count=0,
-    )
+    return ConversationResponse.from_orm_fast(conversation, message_count=0)
 
 
 @router.put("/conversations/{conversation_id}", response_model=ConversationResponse)
@@ -253,15 +192,7 @@ async def update_conversation(
     
     message_count = await conversation_crud.get_message_count(db, conversation_id)
     
-    return ConversationResponse(
-        id=conversation.id,
-        tool_id=conversation.tool_id,
-        title=conversation.title,
-        extra=conversation.extra,
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
-        message_count=message_count,
-    )
+    return ConversationResponse.from_orm_fast(conversation, message_count=message_count)
 
 
 @router.get("/conversations/{conversation_id}/papers")
@@ -4,6 +4,8 @@ Review note:
 - 保留 demo/bib 示例接口。
 - 新增 arxiv-translate 任务接口（创建/查询/取消）。
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 
 from app.schemas.custom_tool import (
@@ -36,6 +38,11 @@ async def run_demo_custom_tool(request: DemoCustomToolRequest):
 @router.post("/bib-lookup", response_model=BibLookupResponse)
 async def bib_lookup(request: BibLookupRequest):
     """根据论文标题查询标准 BibTeX 引用"""
+    # 预加载期间查询会等待 bib_store 的锁，放到线程里执行，不阻塞事件循环
+    return await asyncio.to_thread(_bib_lookup_sync, request)
+
+
+def _bib_lookup_sync(request: BibLookupRequest) -> BibLookupResponse:
     entry_lines = bib_store.lookup(request.title)
     if entry_lines:
         bibtex = bib_store.post_process(
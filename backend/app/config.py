@@ -82,6 +82,13 @@ class Settings(BaseSettings):
     ARXIV_TRANSLATE_DATA_DIR: str = str(
         Path(__file__).resolve().parents[1] / "data" / "custom_tools" / "arxiv_translate"
     )
+    # 译文缓存（不放在 CUSTOM_TOOLS_DATA_DIR 下，避免被静态目录公开）
+    ARXIV_TRANSLATE_CACHE_PATH: str = str(
+        Path(__file__).resolve().parents[1] / "data" / "cache" / "arxiv_translate.sqlite"
+    )
+    # 翻译请求限速（按账号额度填写，0 表示不限制）
+    ARXIV_TRANSLATE_MAX_REQUESTS_PER_MINUTE: int = 0
+    ARXIV_TRANSLATE_MAX_TOKENS_PER_MINUTE: int = 0
 
     @model_validator(mode="before")
     @classmethod
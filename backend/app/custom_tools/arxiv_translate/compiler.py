@@ -2,18 +2,57 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import os
 import re
 import shutil
+import signal
 import subprocess
+import tempfile
 import zipfile
 
 
-def detect_compiler(main_tex_path: Path) -> str:
-    content = main_tex_path.read_text(encoding="utf-8", errors="ignore")[:8000]
-    markers = ["fontspec", "xeCJK", "xetex", "unicode-math", "xltxtra", "xunicode", "ctex"]
-    if any(m in content for m in markers):
+_XELATEX_MARKERS_RE = re.compile(
+    "|".join(
+        re.escape(m)
+        for m in ["fontspec", "xeCJK", "xetex", "unicode-math", "xltxtra", "xunicode", "ctex"]
+    )
+)
+
+
+@dataclass
+class TexFile:
+    """Main tex contents plus the stat they were read at."""
+
+    path: Path
+    text: str
+    mtime_ns: int
+    size: int
+
+
+def load_tex_file(path: Path) -> TexFile:
+    st = path.stat()
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return TexFile(path=path, text=text, mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+
+def _write_tex_file(tex: TexFile, text: str) -> None:
+    tex.path.write_text(text, encoding="utf-8")
+    st = tex.path.stat()
+    tex.text = text
+    tex.mtime_ns = st.st_mtime_ns
+    tex.size = st.st_size
+
+
+def detect_compiler(main_tex_path: Path, *, tex: Optional[TexFile] = None) -> str:
+    if tex is not None:
+        content = tex.text[:8000]
+    else:
+        content = main_tex_path.read_text(encoding="utf-8", errors="ignore")[:8000]
+    if _XELATEX_MARKERS_RE.search(content):
         if command_exists("xelatex"):
             return "xelatex"
     return "pdflatex"
@@ -55,48 +94,122 @@ _CJK_FALLBACK_BLOCK = rf"""
 """.strip()
 
 
-def _insert_after_documentclass(text: str, block: str) -> str:
-    m = re.search(r"\\documentclass(?:\[[^\]]*\])?\{[^}]+\}", text)
+_DOCUMENTCLASS_RE = re.compile(r"\\documentclass(?:\[[^\]]*\])?\{[^}]+\}")
+_CTEX_PACKAGE_RE = re.compile(r"\\usepackage(?:\[[^\]]*\])?\{ctex\}")
+# url loaded on its own, with options, or inside a package list.
+_URL_PACKAGE_RE = re.compile(
+    r"\\(?:usepackage|RequirePackage)(?:\[[^\]]*\])?\{(?:[^}]*,)?\s*url\s*(?:,[^}]*)?\}"
+)
+
+
+def _has_url_package(text: str) -> bool:
+    if "\\usepackage{url}" in text:
+        return True
+    return _URL_PACKAGE_RE.search(text) is not None
+
+
+def _insert_after_documentclass(text: str, block: str) -> Optional[Tuple[int, str]]:
+    m = _DOCUMENTCLASS_RE.search(text)
     if not m:
-        return text
-    return text[: m.end()] + "\n" + block + "\n" + text[m.end() :]
+        return None
+    return m.end(), block
 
 
-def _insert_after_ctex_package(text: str, block: str) -> str:
-    ctex_re = re.compile(r"\\usepackage(?:\[[^\]]*\])?\{ctex\}")
-    m = ctex_re.search(text)
+def _insert_after_ctex_package(text: str, block: str) -> Optional[Tuple[int, str]]:
+    m = _CTEX_PACKAGE_RE.search(text)
     if not m:
         return _insert_after_documentclass(text, block)
-    return text[: m.end()] + "\n" + block + "\n" + text[m.end() :]
+    return m.end(), block
 
 
-def ensure_ctex_support(main_tex_path: Path) -> bool:
+def _apply_inserts(text: str, edits: List[Tuple[int, str]]) -> str:
+    """
+    Splice all (offset, block) edits into text in one pass.
+    Blocks sharing an offset keep their insertion order.
+    """
+    parts: List[str] = []
+    last = 0
+    for offset, block in sorted(edits, key=lambda e: e[0]):
+        parts.append(text[last:offset])
+        parts.append("\n" + block + "\n")
+        last = offset
+    parts.append(text[last:])
+    return "".join(parts)
+
+
+# (st_mtime_ns, st_size) of main tex files last seen in fully patched state.
+_PREAMBLE_FINGERPRINT: Dict[Path, Tuple[int, int]] = {}
+
+
+def _file_fingerprint(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def ensure_ctex_support(main_tex_path: Path, *, tex: Optional[TexFile] = None) -> bool:
     """
     Ensure Chinese-capable XeLaTeX preamble exists and is stable after retries.
     Returns True when file changed.
+    Pass an already loaded `tex` to skip re-reading the file.
     """
-    text = main_tex_path.read_text(encoding="utf-8", errors="replace")
-    changed = False
+    if tex is None:
+        fingerprint = _file_fingerprint(main_tex_path)
+    else:
+        fingerprint = (tex.mtime_ns, tex.size)
+    if fingerprint is not None and _PREAMBLE_FINGERPRINT.get(main_tex_path) == fingerprint:
+        return False
 
+    if tex is None:
+        tex = load_tex_file(main_tex_path)
+    text = tex.text
     has_ctex = ("\\usepackage{ctex}" in text) or ("\\usepackage[UTF8]{ctex}" in text)
+    has_fallback = _CJK_FALLBACK_BEGIN in text
+    # Already patched (the usual case on retries): plain substring checks only.
+    if has_ctex and has_fallback and "\\usepackage{url}" in text:
+        _PREAMBLE_FINGERPRINT[main_tex_path] = (tex.mtime_ns, tex.size)
+        return False
+
+    edits: List[Tuple[int, str]] = []
     if not has_ctex:
-        updated = _insert_after_documentclass(text, "\\usepackage[UTF8]{ctex}")
-        if updated == text:
+        edit = _insert_after_documentclass(text, "\\usepackage[UTF8]{ctex}")
+        if edit is None:
             return False
-        text = updated
-        changed = True
+        edits.append(edit)
 
-    if _CJK_FALLBACK_BEGIN not in text:
-        text = _insert_after_ctex_package(text, _CJK_FALLBACK_BLOCK)
-        changed = True
+    # url goes right after ctex, ahead of the font fallback block.
+    if not _has_url_package(text):
+        edit = _insert_after_ctex_package(text, "\\usepackage{url}")
+        if edit is not None:
+            edits.append(edit)
 
-    if "{url}" not in text:
-        text = _insert_after_ctex_package(text, "\\usepackage{url}")
-        changed = True
+    if not has_fallback:
+        edit = _insert_after_ctex_package(text, _CJK_FALLBACK_BLOCK)
+        if edit is not None:
+            edits.append(edit)
 
-    if changed:
-        main_tex_path.write_text(text, encoding="utf-8")
-    return changed
+    if edits:
+        _write_tex_file(tex, _apply_inserts(text, edits))
+    _PREAMBLE_FINGERPRINT[main_tex_path] = (tex.mtime_ns, tex.size)
+    return bool(edits)
+
+
+# Built once: every pass of every attempt runs with the same environment.
+_LATEX_ENV: Dict[str, str] = {
+    **os.environ,
+    "LC_ALL": "C.UTF-8",
+    "TEXINPUTS": "." + os.pathsep + os.environ.get("TEXINPUTS", ""),
+}
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    # Also reaps helpers (font tools, epstopdf, ...) spawned by the compiler.
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except OSError:
+        proc.kill()
 
 
 def _run_command(
@@ -105,48 +218,100 @@ def _run_command(
     cwd: Path,
     timeout_sec: int,
     log_fp,
+    env: Optional[Dict[str, str]] = None,
 ) -> Dict[str, int | bool]:
+    """
+    Run one compile step with stdout/stderr attached straight to the log file,
+    so compiler output never passes through Python.
+    """
+    log_fp.write(f"$ {' '.join(cmd)}\n")
+    log_fp.flush()
+    log_fd = log_fp.fileno()
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=str(cwd),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            timeout=timeout_sec,
-            check=False,
-            text=True,
-            encoding="utf-8",
-            errors="replace",
+            env=env or _LATEX_ENV,
+            stdout=log_fd,
+            stderr=log_fd,
+            start_new_session=True,
         )
-        output = proc.stdout or ""
-        return_code = int(proc.returncode)
+    except FileNotFoundError as exc:
+        raise RuntimeError(f"命令不存在：{cmd[0]}") from exc
+
+    try:
+        return_code = int(proc.wait(timeout=timeout_sec))
         timed_out = False
-    except subprocess.TimeoutExpired as exc:
-        output = (exc.stdout or "") + "\n[timeout]\n" + (exc.stderr or "")
+    except subprocess.TimeoutExpired:
+        _kill_process_group(proc)
+        proc.wait()
+        log_fp.write("\n[timeout]\n")
         return_code = 124
         timed_out = True
-    except FileNotFoundError as exc:
-        raise RuntimeError(f"命令不存在：{cmd[0]}") from exc
 
-    log_fp.write(f"$ {' '.join(cmd)}\n")
-    log_fp.write(output)
     log_fp.write("\n\n")
-    return {"returncode": return_code, "timed_out": timed_out, "output": output}
+    return {"returncode": return_code, "timed_out": timed_out}
 
 
-def _bbl_has_entries(bbl_file: Path) -> bool:
-    if not bbl_file.exists():
-        return False
+def _read_log_from(log_file: Path, offset: int) -> str:
+    with log_file.open("rb") as fp:
+        fp.seek(offset)
+        return fp.read().decode("utf-8", errors="replace")
+
+
+@lru_cache(maxsize=64)
+def _bbl_file_has_entries(path_str: str, mtime_ns: int, size: int) -> bool:
+    # mtime_ns/size only take part in the cache key.
     try:
-        text = bbl_file.read_text(encoding="utf-8", errors="ignore")
+        text = Path(path_str).read_text(encoding="utf-8", errors="ignore")
     except Exception:
         return False
     return ("\\bibitem" in text) and (len(text.strip()) > 80)
 
 
-_ERROR_RE = re.compile(
-    r"(?m)^(?:\./)?(?P<file>[^\n:]+?\.tex):(?P<line>\d+):\s*(?P<msg>.+)$"
+def _bbl_has_entries(bbl_file: Path) -> bool:
+    fingerprint = _file_fingerprint(bbl_file)
+    if fingerprint is None:
+        return False
+    return _bbl_file_has_entries(str(bbl_file), *fingerprint)
+
+
+# One automaton for both the file:line error and the bare "l.<n>" marker.
+_ANY_ERROR_RE = re.compile(
+    r"(?m)^(?:(?:\./)?(?P<file>[^\n:]+?\.tex):(?P<line>\d+):\s*(?P<msg>.+)$|l\.(?P<fallback_line>\d+)\b)"
 )
+# Later passes repeat the errors of earlier ones, so the tail is usually enough.
+_LOG_TAIL_CHARS = 200_000
+
+_LogMatches = Tuple[Optional[re.Match[str]], Optional[re.Match[str]]]
+
+
+def _scan_log_errors(log_text: str, pos: int = 0, endpos: Optional[int] = None) -> _LogMatches:
+    """
+    Return (first file:line error, first l.<n> marker) in a single traversal,
+    stopping as soon as a file:line error is found.
+    """
+    fallback: Optional[re.Match[str]] = None
+    for m in _ANY_ERROR_RE.finditer(log_text, pos, len(log_text) if endpos is None else endpos):
+        if m.group("file") is not None:
+            return m, fallback
+        if fallback is None:
+            fallback = m
+    return None, fallback
+
+
+def _find_log_errors(log_text: str) -> _LogMatches:
+    """
+    Scan the log tail first; only walk the head when the tail has no file:line error.
+    """
+    if len(log_text) <= _LOG_TAIL_CHARS:
+        return _scan_log_errors(log_text)
+    tail_start = len(log_text) - _LOG_TAIL_CHARS
+    error, tail_fallback = _scan_log_errors(log_text, tail_start)
+    if error:
+        return error, tail_fallback
+    error, head_fallback = _scan_log_errors(log_text, 0, tail_start)
+    return error, head_fallback or tail_fallback
 
 
 def parse_first_latex_error(
@@ -156,7 +321,7 @@ def parse_first_latex_error(
     project_root: Path,
     main_tex_rel: Path,
 ) -> Optional[Dict[str, str | int]]:
-    m = _ERROR_RE.search(log_text)
+    m, fallback = _find_log_errors(log_text)
     if m:
         raw_file = m.group("file").strip()
         line = int(m.group("line"))
@@ -183,17 +348,60 @@ def parse_first_latex_error(
             "message": msg,
         }
 
-    fallback = re.search(r"(?m)^l\.(?P<line>\d+)\b", log_text)
     if fallback:
         return {
             "file": str(main_tex_rel),
             "file_rel": str(main_tex_rel).replace("\\", "/"),
-            "line": int(fallback.group("line")),
+            "line": int(fallback.group("fallback_line")),
             "message": "无法定位 tex 文件，使用主文件行号回退。",
         }
     return None
 
 
+_TMPFS_ROOT = Path("/dev/shm")
+
+
+def _make_build_dir(compile_dir: Path) -> Optional[Path]:
+    """
+    Create a tmpfs directory for aux/log/bbl/pdf outputs of one compile attempt.
+    Sub-directories of compile_dir are mirrored so \\include'd files can write
+    their own .aux. Returns None when tmpfs is unavailable.
+    """
+    if not _TMPFS_ROOT.is_dir() or not os.access(_TMPFS_ROOT, os.W_OK):
+        return None
+    build_dir: Optional[Path] = None
+    try:
+        build_dir = Path(tempfile.mkdtemp(prefix="latex-", dir=_TMPFS_ROOT))
+        for dirpath, dirnames, _ in os.walk(compile_dir):
+            rel = Path(dirpath).relative_to(compile_dir)
+            for name in dirnames:
+                (build_dir / rel / name).mkdir(exist_ok=True)
+    except OSError:
+        if build_dir is not None:
+            shutil.rmtree(build_dir, ignore_errors=True)
+        return None
+    return build_dir
+
+
+def _bibtex_env(compile_dir: Path) -> Dict[str, str]:
+    # bibtex runs inside the build dir; keep .bib/.bst lookups on the sources.
+    env = dict(_LATEX_ENV)
+    for var in ("BIBINPUTS", "BSTINPUTS"):
+        env[var] = str(compile_dir) + os.pathsep + env.get(var, "")
+    return env
+
+
+def _collect_build_outputs(build_dir: Path, compile_dir: Path, main_stem: str) -> None:
+    # The bbl is kept too, so later attempts can reuse it instead of rerunning bibtex.
+    for name in (f"{main_stem}.pdf", f"{main_stem}.bbl"):
+        built = build_dir / name
+        if built.exists():
+            # Replace rather than overwrite: the target may be hardlinked to the source tree.
+            target = compile_dir / name
+            target.unlink(missing_ok=True)
+            shutil.copyfile(built, target)
+
+
 def compile_latex_project(
     *,
     project_root: Path,
@@ -204,14 +412,19 @@ def compile_latex_project(
     attempt_index: int | None = None,
     attempt_total: int | None = None,
     force_compiler: str | None = None,
+    ensure_cjk: bool = False,
 ) -> Dict:
     main_tex_abs = project_root / main_tex_rel
-    if not main_tex_abs.exists():
-        raise RuntimeError(f"主 tex 不存在: {main_tex_rel}")
+    try:
+        tex = load_tex_file(main_tex_abs)
+    except FileNotFoundError as exc:
+        raise RuntimeError(f"主 tex 不存在: {main_tex_rel}") from exc
 
+    if ensure_cjk:
+        ensure_ctex_support(main_tex_abs, tex=tex)
     compile_dir = main_tex_abs.parent
     main_stem = main_tex_abs.stem
-    compiler = force_compiler or detect_compiler(main_tex_abs)
+    compiler = force_compiler or detect_compiler(main_tex_abs, tex=tex)
     log_file = log_path or (project_root / "compile.log")
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -222,64 +435,78 @@ def compile_latex_project(
     mode = "a" if append_log and log_file.exists() else "w"
     return_codes: List[int] = []
     timed_out = False
-    attempt_log_chunks: List[str] = []
-
-    with log_file.open(mode, encoding="utf-8") as log_fp:
-        if mode == "a":
-            log_fp.write("\n\n")
-        if attempt_index is not None and attempt_total is not None:
-            log_fp.write(f"===== Compile Attempt {attempt_index}/{attempt_total} =====\n")
-        else:
-            log_fp.write("===== Compile Attempt =====\n")
-
-        bbl_file = compile_dir / f"{main_stem}.bbl"
-        keep_existing_bbl = _bbl_has_entries(bbl_file)
-        if keep_existing_bbl:
-            log_fp.write(f"[info] keep existing bbl: {bbl_file.name}\n\n")
-
-        first = _run_command(
-            [compiler, "-interaction=nonstopmode", "-file-line-error", f"{main_stem}.tex"],
-            cwd=compile_dir,
-            timeout_sec=timeout_sec,
-            log_fp=log_fp,
-        )
-        return_codes.append(int(first["returncode"]))
-        timed_out = timed_out or bool(first["timed_out"])
-        attempt_log_chunks.append(str(first.get("output") or ""))
-
-        aux_file = compile_dir / f"{main_stem}.aux"
-        if aux_file.exists() and (not keep_existing_bbl):
-            bib = _run_command(
-                ["bibtex", main_stem],
+
+    # Passes write aux/toc/bbl to tmpfs and re-read them from memory.
+    build_dir = _make_build_dir(compile_dir)
+    out_dir = build_dir or compile_dir
+    latex_cmd = [compiler, "-interaction=nonstopmode", "-file-line-error"]
+    if build_dir is not None:
+        latex_cmd.append(f"-output-directory={build_dir}")
+    latex_cmd.append(f"{main_stem}.tex")
+
+    try:
+        with log_file.open(mode, encoding="utf-8") as log_fp:
+            if mode == "a":
+                log_fp.write("\n\n")
+            if attempt_index is not None and attempt_total is not None:
+                log_fp.write(f"===== Compile Attempt {attempt_index}/{attempt_total} =====\n")
+            else:
+                log_fp.write("===== Compile Attempt =====\n")
+
+            log_fp.flush()
+            attempt_offset = os.fstat(log_fp.fileno()).st_size
+
+            bbl_file = compile_dir / f"{main_stem}.bbl"
+            keep_existing_bbl = _bbl_has_entries(bbl_file)
+            if keep_existing_bbl:
+                log_fp.write(f"[info] keep existing bbl: {bbl_file.name}\n\n")
+
+            first = _run_command(
+                latex_cmd,
                 cwd=compile_dir,
                 timeout_sec=timeout_sec,
                 log_fp=log_fp,
             )
-            return_codes.append(int(bib["returncode"]))
-            timed_out = timed_out or bool(bib["timed_out"])
-            attempt_log_chunks.append(str(bib.get("output") or ""))
-
-        second = _run_command(
-            [compiler, "-interaction=nonstopmode", "-file-line-error", f"{main_stem}.tex"],
-            cwd=compile_dir,
-            timeout_sec=timeout_sec,
-            log_fp=log_fp,
-        )
-        return_codes.append(int(second["returncode"]))
-        timed_out = timed_out or bool(second["timed_out"])
-        attempt_log_chunks.append(str(second.get("output") or ""))
-
-        third = _run_command(
-            [compiler, "-interaction=nonstopmode", "-file-line-error", f"{main_stem}.tex"],
-            cwd=compile_dir,
-            timeout_sec=timeout_sec,
-            log_fp=log_fp,
-        )
-        return_codes.append(int(third["returncode"]))
-        timed_out = timed_out or bool(third["timed_out"])
-        attempt_log_chunks.append(str(third.get("output") or ""))
+            return_codes.append(int(first["returncode"]))
+            timed_out = timed_out or bool(first["timed_out"])
+
+            aux_file = out_dir / f"{main_stem}.aux"
+            if aux_file.exists() and (not keep_existing_bbl):
+                bib = _run_command(
+                    ["bibtex", main_stem],
+                    cwd=out_dir,
+                    timeout_sec=timeout_sec,
+                    log_fp=log_fp,
+                    env=_bibtex_env(compile_dir) if build_dir is not None else None,
+                )
+                return_codes.append(int(bib["returncode"]))
+                timed_out = timed_out or bool(bib["timed_out"])
+
+            second = _run_command(
+                latex_cmd,
+                cwd=compile_dir,
+                timeout_sec=timeout_sec,
+                log_fp=log_fp,
+            )
+            return_codes.append(int(second["returncode"]))
+            timed_out = timed_out or bool(second["timed_out"])
+
+            third = _run_command(
+                latex_cmd,
+                cwd=compile_dir,
+                timeout_sec=timeout_sec,
+                log_fp=log_fp,
+            )
+            return_codes.append(int(third["returncode"]))
+            timed_out = timed_out or bool(third["timed_out"])
+
+        if build_dir is not None:
+            _collect_build_outputs(build_dir, compile_dir, main_stem)
+    finally:
+        if build_dir is not None:
+            shutil.rmtree(build_dir, ignore_errors=True)
 
-    log_text = "\n".join(attempt_log_chunks)
+    log_text = _read_log_from(log_file, attempt_offset)
     first_error = parse_first_latex_error(
         log_text,
         compile_dir=compile_dir,
@@ -309,7 +536,8 @@ def build_project_zip(source_dir: Path, output_zip: Path) -> Path:
     if output_zip.exists():
         output_zip.unlink()
 
-    with zipfile.ZipFile(output_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+    # Zip64 stays allowed: small archives get no zip64 records anyway.
+    with zipfile.ZipFile(output_zip, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
         for file_path in source_dir.rglob("*"):
             if not file_path.is_file():
                 continue
@@ -319,6 +547,7 @@ def build_project_zip(source_dir: Path, output_zip: Path) -> Path:
 
 
 def copy_file(src: Path, dst: Path) -> Path:
+    # copyfile (not copy/copy2): content only, no extra stat/chmod for metadata.
     dst.parent.mkdir(parents=True, exist_ok=True)
     shutil.copyfile(src, dst)
     return dst
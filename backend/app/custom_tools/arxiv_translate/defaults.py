@@ -10,3 +10,4 @@ DEFAULT_LLM_TIMEOUT_SEC = 120
 DEFAULT_COMPILE_TIMEOUT_SEC = 180
 DEFAULT_MAX_COMPILE_TRIES = 32
 DEFAULT_COMPILE_REPAIR_BASE_WINDOW = 5
+DEFAULT_TRANSLATION_CACHE_TTL_DAYS = 30
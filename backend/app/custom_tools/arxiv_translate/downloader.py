@@ -8,7 +8,8 @@ Review note:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
+import asyncio
 import tarfile
 import zipfile
 
@@ -37,6 +38,86 @@ def resolve_arxiv_input(raw: str) -> Tuple[str, str]:
     raise ValueError("无法识别 arXiv 链接或 ID。")
 
 
+_STREAM_CHUNK_BYTES = 64 * 1024
+# Probe status for a HEAD that timed out; 0 means any other transport error.
+_PROBE_TIMED_OUT = -1
+
+
+async def _probe_candidate(client: httpx.AsyncClient, url: str) -> Tuple[str, int, str]:
+    try:
+        resp = await client.head(url)
+    except httpx.TimeoutException:
+        return url, _PROBE_TIMED_OUT, ""
+    except httpx.HTTPError:
+        return url, 0, ""
+    return url, resp.status_code, (resp.headers.get("content-type") or "").lower()
+
+
+def _order_candidates(probes: List[Tuple[str, int, str]]) -> List[str]:
+    """
+    Put candidates whose HEAD looks like a source package first.
+    Definitive 404/410 and timed-out probes are dropped, so a stalled mirror
+    is not waited on again by GET; other inconclusive probes stay as fallbacks.
+    """
+    preferred: List[str] = []
+    fallback: List[str] = []
+    for url, status, content_type in probes:
+        if 200 <= status < 300 and "text/html" not in content_type:
+            preferred.append(url)
+        elif status not in (404, 410, _PROBE_TIMED_OUT):
+            fallback.append(url)
+    return preferred + fallback
+
+
+async def _download_first_available(
+    candidate_urls: List[str],
+    output_path: Path,
+    timeout_sec: int,
+) -> str:
+    async with httpx.AsyncClient(timeout=timeout_sec, follow_redirects=True) as client:
+        probes = await asyncio.gather(*[_probe_candidate(client, url) for url in candidate_urls])
+        last_error: Optional[str] = None
+        for url, status, _ in probes:
+            if status == _PROBE_TIMED_OUT:
+                last_error = f"{url}: HEAD timed out"
+        for url in _order_candidates(list(probes)):
+            try:
+                async with client.stream("GET", url) as resp:
+                    if resp.status_code >= 400:
+                        last_error = f"{url}: status={resp.status_code}"
+                        continue
+
+                    chunks = resp.aiter_bytes(_STREAM_CHUNK_BYTES)
+                    first_chunk = await anext(chunks, b"")
+                    if not first_chunk:
+                        last_error = f"{url}: status={resp.status_code}"
+                        continue
+
+                    # Sniff only the head of the first chunk instead of decoding the whole body.
+                    content_type = (resp.headers.get("content-type") or "").lower()
+                    if "text/" in content_type:
+                        body_head = first_chunk[:512].decode(resp.charset_encoding or "utf-8", errors="ignore").lower()
+                        if "text/html" in content_type and ("no source" in body_head or "abs/" in body_head):
+                            last_error = f"{url}: no source package available"
+                            continue
+
+                    try:
+                        with output_path.open("wb") as fp:
+                            fp.write(first_chunk)
+                            async for chunk in chunks:
+                                fp.write(chunk)
+                    except BaseException:
+                        # Do not leave a truncated archive behind.
+                        output_path.unlink(missing_ok=True)
+                        raise
+                    return url
+            except httpx.HTTPError as exc:
+                last_error = f"{url}: {exc}"
+                continue
+
+    raise RuntimeError(f"下载 arXiv 源码失败：{last_error or 'unknown error'}")
+
+
 def download_arxiv_source_archive(
     *,
     paper_id: str,
@@ -47,6 +128,10 @@ def download_arxiv_source_archive(
     """
     Download arXiv source archive to output_path.
     Returns the final source URL used.
+
+    All candidate URLs are probed concurrently with HEAD, then streamed in
+    order of how promising the probe looked. Candidates whose HEAD timed out
+    are skipped, so stalled mirrors cost one shared timeout instead of four.
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
     candidate_ids = [paper_id]
@@ -58,29 +143,7 @@ def download_arxiv_source_archive(
         candidate_urls.append(f"https://arxiv.org/src/{pid}")
         candidate_urls.append(f"https://arxiv.org/e-print/{pid}")
 
-    with httpx.Client(timeout=timeout_sec, follow_redirects=True) as client:
-        last_error: Optional[str] = None
-        for url in candidate_urls:
-            try:
-                resp = client.get(url)
-            except httpx.HTTPError as exc:
-                last_error = f"{url}: {exc}"
-                continue
-
-            if resp.status_code >= 400 or not resp.content:
-                last_error = f"{url}: status={resp.status_code}"
-                continue
-
-            content_type = (resp.headers.get("content-type") or "").lower()
-            body_head = resp.text[:500].lower() if "text/" in content_type else ""
-            if "text/html" in content_type and ("no source" in body_head or "abs/" in body_head):
-                last_error = f"{url}: no source package available"
-                continue
-
-            output_path.write_bytes(resp.content)
-            return url
-
-    raise RuntimeError(f"下载 arXiv 源码失败：{last_error or 'unknown error'}")
+    return asyncio.run(_download_first_available(candidate_urls, output_path, timeout_sec))
 
 
 def _is_within(base: Path, target: Path) -> bool:
@@ -7,13 +7,20 @@ Review note:
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import asyncio
-import json
+import heapq
+import os
 import re
 import shutil
+import threading
+import time
 import traceback
 import uuid
 
@@ -36,6 +43,7 @@ from app.custom_tools.arxiv_translate.defaults import (
     DEFAULT_MAX_COMPILE_TRIES,
     DEFAULT_TARGET_LANGUAGE,
     DEFAULT_TRANSLATE_MODEL,
+    DEFAULT_TRANSLATION_CACHE_TTL_DAYS,
 )
 from app.custom_tools.arxiv_translate.downloader import (
     download_arxiv_source_archive,
@@ -54,6 +62,7 @@ from app.custom_tools.arxiv_translate.storage import (
     artifact_payload,
     build_job_paths,
     ensure_job_dirs,
+    load_json_file,
     save_job_json,
 )
 from app.custom_tools.arxiv_translate.tex_project import (
@@ -61,6 +70,7 @@ from app.custom_tools.arxiv_translate.tex_project import (
     find_main_tex_file,
     normalize_project_root,
 )
+from app.custom_tools.arxiv_translate.translation_cache import TranslationCache
 from app.custom_tools.arxiv_translate.translator import TranslatorConfig, translate_chunks
 from app.services.sources.arxiv.downloader import download_arxiv_pdf
 
@@ -69,9 +79,60 @@ STATIC_PREFIX = "/custom-tools-files/arxiv_translate"
 _jobs: Dict[str, Dict[str, Any]] = {}
 _jobs_lock = asyncio.Lock()
 
+# Segment planning is CPU-bound pure Python, so it runs in worker processes.
+_plan_executor: Optional[ProcessPoolExecutor] = None
+_plan_executor_failed = False
+_plan_executor_lock = threading.Lock()
+
+_translation_cache = TranslationCache(
+    Path(settings.ARXIV_TRANSLATE_CACHE_PATH),
+    ttl_sec=DEFAULT_TRANSLATION_CACHE_TTL_DAYS * 24 * 3600,
+)
+
+_now_iso_prefix: Tuple[int, str] = (-1, "")
+
+_TERMINAL_STATUSES = frozenset({"succeeded", "failed", "cancelled"})
+_PERSIST_MIN_INTERVAL_SEC = 0.5
+
+# In-process LRU caches of on-disk job state, keyed by file mtimes.
+_disk_cache_lock = threading.Lock()
+_SUCCESS_SNAPSHOT_CACHE_SIZE = 256
+_success_snapshot_cache: OrderedDict[
+    str, Tuple[int, Optional[JobPaths], Optional[Tuple[int, int]], Optional[Dict[str, Any]]]
+] = OrderedDict()
+_HISTORY_ROW_CACHE_SIZE = 1024
+_history_row_cache: OrderedDict[str, Tuple[int, str, Optional[Dict[str, Any]]]] = OrderedDict()
+_SNAPSHOT_FILE_CACHE_SIZE = 1024
+_snapshot_file_cache: OrderedDict[str, Tuple[Tuple[int, int], Optional[Dict[str, Any]]]] = OrderedDict()
+
+
+def _disk_cache_get(cache: OrderedDict, key: str) -> Any:
+    """LRU lookup; call with _disk_cache_lock held."""
+    entry = cache.get(key)
+    if entry is not None:
+        cache.move_to_end(key)
+    return entry
+
+
+def _disk_cache_put(cache: OrderedDict, key: str, entry: Any, max_size: int) -> None:
+    """LRU insert; call with _disk_cache_lock held."""
+    cache[key] = entry
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
+
 
 def _now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    # Same shape as datetime.now(timezone.utc).isoformat(), but always with
+    # microseconds so timestamps sort correctly as strings. The second-level
+    # prefix is formatted once per second.
+    global _now_iso_prefix
+    sec, ns = divmod(time.time_ns(), 1_000_000_000)
+    cached = _now_iso_prefix
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+        _now_iso_prefix = cached
+    return f"{cached[1]}.{ns // 1000:06d}+00:00"
 
 
 def _get_job(job_id: str) -> Dict[str, Any]:
@@ -81,7 +142,18 @@ def _get_job(job_id: str) -> Dict[str, Any]:
     return job
 
 
-def _snapshot(job: Dict[str, Any]) -> Dict[str, Any]:
+def _snapshot(job: Dict[str, Any], *, detach: bool = False) -> Dict[str, Any]:
+    """
+    Public view of a job. By default steps/artifacts/meta are the live objects:
+    API responses are validated before the event loop runs anything else, so
+    they cannot change underneath. Pass detach=True when the snapshot leaves
+    the loop thread (e.g. job.json writes in a worker thread).
+    """
+    steps = job.get("steps", [])
+    artifacts = job.get("artifacts", [])
+    meta = job.get("meta", {})
+    if detach:
+        steps, artifacts, meta = list(steps), list(artifacts), dict(meta)
     return {
         "job_id": job["job_id"],
         "status": job["status"],
@@ -91,9 +163,9 @@ def _snapshot(job: Dict[str, Any]) -> Dict[str, Any]:
         "created_at": job["created_at"],
         "updated_at": job["updated_at"],
         "error": job.get("error"),
-        "steps": list(job.get("steps", [])),
-        "artifacts": list(job.get("artifacts", [])),
-        "meta": dict(job.get("meta", {})),
+        "steps": steps,
+        "artifacts": artifacts,
+        "meta": meta,
     }
 
 
@@ -118,19 +190,59 @@ def _append_step(
     job["updated_at"] = _now_iso()
 
 
-def _persist_job(job: Dict[str, Any]) -> None:
+async def _persist_job_async(job: Dict[str, Any], *, throttle: bool = False) -> None:
+    """
+    Write job.json on a worker thread. With throttle=True (progress ticks) the
+    write is skipped if the last one was under _PERSIST_MIN_INTERVAL_SEC ago
+    and the status has not changed; the next milestone write carries the
+    skipped updates.
+    """
     paths: Optional[JobPaths] = job.get("_paths")
     if not paths:
         return
-    payload = _snapshot(job)
-    save_job_json(paths, payload)
+    now = time.monotonic()
+    if (
+        throttle
+        and job["status"] not in _TERMINAL_STATUSES
+        and job.get("_last_persist_status") == job["status"]
+        and now - float(job.get("_last_persist_ts") or 0.0) < _PERSIST_MIN_INTERVAL_SEC
+    ):
+        return
+    job["_last_persist_ts"] = now
+    job["_last_persist_status"] = job["status"]
+    job["_persist_dirty"] = False
+    # Serialize writes per job so an older snapshot never lands after a newer one.
+    lock = job.setdefault("_persist_lock", asyncio.Lock())
+    async with lock:
+        payload = _snapshot(job, detach=True)
+        await asyncio.to_thread(save_job_json, paths, payload)
+
+
+def _schedule_persist(job: Dict[str, Any]) -> None:
+    """
+    Mark the job dirty and let a background flusher write it at most once per
+    _PERSIST_MIN_INTERVAL_SEC. Terminal states still await _persist_job_async
+    directly, which also clears the pending flush.
+    """
+    job["_persist_dirty"] = True
+    flusher = job.get("_persist_flusher")
+    if flusher is None or flusher.done():
+        job["_persist_flusher"] = asyncio.create_task(_flush_job_later(job))
+
+
+async def _flush_job_later(job: Dict[str, Any]) -> None:
+    elapsed = time.monotonic() - float(job.get("_last_persist_ts") or 0.0)
+    if elapsed < _PERSIST_MIN_INTERVAL_SEC:
+        await asyncio.sleep(_PERSIST_MIN_INTERVAL_SEC - elapsed)
+    if job.get("_persist_dirty"):
+        await _persist_job_async(job)
 
 
 def _read_json_file(path: Path) -> Optional[Dict[str, Any]]:
     if not path.exists():
         return None
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return load_json_file(path)
     except Exception:
         return None
 
@@ -138,20 +250,34 @@ def _read_json_file(path: Path) -> Optional[Dict[str, Any]]:
 def _scan_brace_payload(text: str, open_pos: int) -> Optional[str]:
     if open_pos < 0 or open_pos >= len(text) or text[open_pos] != "{":
         return None
-    depth = 0
-    for i in range(open_pos, len(text)):
-        ch = text[i]
-        if ch == "{":
+    # Hop between braces with str.find so the text in between is skipped in C.
+    depth = 1
+    next_open = text.find("{", open_pos + 1)
+    next_close = text.find("}", open_pos + 1)
+    while next_close >= 0:
+        if 0 <= next_open < next_close:
             depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return text[open_pos + 1 : i]
+            next_open = text.find("{", next_open + 1)
+            continue
+        depth -= 1
+        if depth == 0:
+            return text[open_pos + 1 : next_close]
+        next_close = text.find("}", next_close + 1)
     return None
 
 
-def _extract_command_payload(text: str, command: str) -> Optional[str]:
-    pattern = re.compile(rf"\\{re.escape(command)}\*?(?:\s*\[[^\]]*\])*\s*\{{", re.DOTALL)
+_TITLE_COMMANDS = ("title", "icmltitle", "iclrtitle", "neuripsfinalcopytitle")
+_TITLE_CMD_RES = {
+    cmd: re.compile(rf"\\{re.escape(cmd)}\*?(?:\s*\[[^\]]*\])*\s*\{{", re.DOTALL)
+    for cmd in _TITLE_COMMANDS
+}
+_CLEAN_CMD_ARG_RE = re.compile(r"\\[a-zA-Z]+\*?(?:\[[^\]]*\])?\{([^{}]*)\}")
+_CLEAN_CMD_RE = re.compile(r"\\[a-zA-Z]+\*?")
+_WS_RE = re.compile(r"\s+")
+_TITLE_HEAD_BYTES = 64 * 1024
+
+
+def _extract_command_payload(text: str, pattern: re.Pattern[str]) -> Optional[str]:
     m = pattern.search(text)
     if not m:
         return None
@@ -163,10 +289,10 @@ def _clean_tex_title(raw: str) -> str:
     out = (raw or "").strip()
     if not out:
         return ""
-    out = re.sub(r"\\[a-zA-Z]+\*?(?:\[[^\]]*\])?\{([^{}]*)\}", r"\1", out)
-    out = re.sub(r"\\[a-zA-Z]+\*?", " ", out)
+    out = _CLEAN_CMD_ARG_RE.sub(r"\1", out)
+    out = _CLEAN_CMD_RE.sub(" ", out)
     out = out.replace("{", " ").replace("}", " ").replace("~", " ")
-    out = re.sub(r"\s+", " ", out).strip()
+    out = _WS_RE.sub(" ", out).strip()
     return out[:240]
 
 
@@ -174,15 +300,45 @@ def _extract_paper_title_from_main_tex(project_root: Path, main_tex_rel: Path) -
     full = project_root / main_tex_rel
     if not full.exists():
         return ""
-    text = full.read_text(encoding="utf-8", errors="ignore")
-    for cmd in ["title", "icmltitle", "iclrtitle", "neuripsfinalcopytitle"]:
-        payload = _extract_command_payload(text, cmd)
+    # Titles live in the preamble, so try the head of the file first.
+    with full.open("rb") as fh:
+        head = fh.read(_TITLE_HEAD_BYTES)
+        truncated = bool(fh.read(1))
+    title = _title_from_text(head.decode("utf-8", errors="ignore"), complete=not truncated)
+    if title is None:
+        title = _title_from_text(full.read_text(encoding="utf-8", errors="ignore"), complete=True)
+    return title or ""
+
+
+def _title_from_text(text: str, *, complete: bool) -> Optional[str]:
+    """
+    Return the cleaned title, "" if there is none, or None when text is only a
+    prefix and a title command may be cut off or further down.
+    """
+    for pattern in _TITLE_CMD_RES.values():
+        payload = _extract_command_payload(text, pattern)
+        if payload is None and not complete:
+            return None
         cleaned = _clean_tex_title(payload or "")
         if cleaned:
             return cleaned
     return ""
 
 
+@lru_cache(maxsize=512)
+def _extract_paper_title_cached(project_root: str, main_tex_rel: str, mtime_ns: int) -> str:
+    return _extract_paper_title_from_main_tex(Path(project_root), Path(main_tex_rel))
+
+
+def _history_title(project_root: Path, main_tex_rel: Path) -> str:
+    """Title lookup for history rows; re-reads the tex only when its mtime changes."""
+    try:
+        mtime_ns = (project_root / main_tex_rel).stat().st_mtime_ns
+    except OSError:
+        return ""
+    return _extract_paper_title_cached(str(project_root), str(main_tex_rel), mtime_ns)
+
+
 def _build_task_name(paper_id: str, title: str) -> str:
     if title:
         return f"arXiv:{paper_id} · {title}"
@@ -235,6 +391,25 @@ def _ensure_original_pdf(paths: JobPaths, *, paper_id: str, canonical_id: str) -
 
 
 def _load_disk_job_snapshot(job_json_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        st = job_json_path.stat()
+    except OSError:
+        return None
+    key = str(job_json_path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _disk_cache_lock:
+        cached = _disk_cache_get(_snapshot_file_cache, key)
+    if cached and cached[0] == stamp:
+        payload = cached[1]
+    else:
+        payload = _parse_disk_job_snapshot(job_json_path)
+        with _disk_cache_lock:
+            _disk_cache_put(_snapshot_file_cache, key, (stamp, payload), _SNAPSHOT_FILE_CACHE_SIZE)
+    # Callers only replace top-level keys, so a shallow copy keeps the cached dict intact.
+    return dict(payload) if payload else None
+
+
+def _parse_disk_job_snapshot(job_json_path: Path) -> Optional[Dict[str, Any]]:
     payload = _read_json_file(job_json_path)
     if not payload:
         return None
@@ -259,11 +434,83 @@ def _job_paths_from_job_json(job_json_path: Path) -> Optional[JobPaths]:
         return None
 
 
+def _iter_job_json(base_dir: Path) -> Iterator[Tuple[Path, int]]:
+    """Yield (job.json path, mtime_ns) for every <canonical_id>/<job_id>/job.json."""
+    try:
+        paper_entries = list(os.scandir(base_dir))
+    except OSError:
+        return
+    for paper_entry in paper_entries:
+        if not paper_entry.is_dir():
+            continue
+        try:
+            job_entries = list(os.scandir(paper_entry.path))
+        except OSError:
+            continue
+        for job_entry in job_entries:
+            if not job_entry.is_dir():
+                continue
+            job_json = os.path.join(job_entry.path, "job.json")
+            try:
+                mtime_ns = os.stat(job_json).st_mtime_ns
+            except OSError:
+                continue
+            yield Path(job_json), mtime_ns
+
+
+def _latest_job_json_mtime_ns(canonical_dir: Path) -> int:
+    latest = 0
+    with os.scandir(canonical_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            try:
+                mtime_ns = os.stat(os.path.join(entry.path, "job.json")).st_mtime_ns
+            except OSError:
+                continue
+            latest = max(latest, mtime_ns)
+    return latest
+
+
 def _find_cached_success_snapshot(canonical_id: str) -> Optional[Dict[str, Any]]:
     base_dir = Path(settings.ARXIV_TRANSLATE_DATA_DIR) / canonical_id
     if not base_dir.exists():
         return None
 
+    # Any new or updated job.json under this paper changes the key; so does
+    # deleting or rewriting the chosen job's job.json or its output files.
+    latest = _latest_job_json_mtime_ns(base_dir)
+    with _disk_cache_lock:
+        cached = _disk_cache_get(_success_snapshot_cache, canonical_id)
+    if cached and cached[0] == latest and (cached[1] is None or _success_stamp(cached[1]) == cached[2]):
+        snapshot = cached[3]
+    else:
+        paths, snapshot = _scan_success_snapshot(base_dir, canonical_id)
+        stamp = _success_stamp(paths) if paths else None
+        # Without original.pdf the next call retries the download instead of reusing the fallback URL.
+        if paths is None or (stamp is not None and (paths.output_dir / "original.pdf").exists()):
+            with _disk_cache_lock:
+                _disk_cache_put(
+                    _success_snapshot_cache,
+                    canonical_id,
+                    (latest, paths, stamp, snapshot),
+                    _SUCCESS_SNAPSHOT_CACHE_SIZE,
+                )
+    return dict(snapshot) if snapshot else None
+
+
+def _success_stamp(paths: JobPaths) -> Optional[Tuple[int, int]]:
+    """(job.json, output dir) mtimes of a successful job; None once either is gone."""
+    try:
+        return paths.job_json.stat().st_mtime_ns, paths.output_dir.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_success_snapshot(
+    base_dir: Path,
+    canonical_id: str,
+) -> Tuple[Optional[JobPaths], Optional[Dict[str, Any]]]:
     candidates = sorted(
         base_dir.glob("*/job.json"),
         key=lambda p: p.stat().st_mtime if p.exists() else 0,
@@ -292,15 +539,17 @@ def _find_cached_success_snapshot(canonical_id: str) -> Optional[Dict[str, Any]]
         title = str(meta.get("paper_title") or "")
         meta.setdefault("task_name", _build_task_name(paper_id, title))
         snapshot["meta"] = meta
-        return snapshot
-    return None
+        return paths, snapshot
+    return None, None
 
 
 def _load_job_snapshot_from_disk(job_id: str) -> Optional[Dict[str, Any]]:
     base_dir = Path(settings.ARXIV_TRANSLATE_DATA_DIR)
     if not base_dir.exists():
         return None
-    for job_json in base_dir.glob(f"*/*/job.json"):
+    for job_json, _ in _iter_job_json(base_dir):
+        if job_json.parent.name != job_id:
+            continue
         snap = _load_disk_job_snapshot(job_json)
         if not snap:
             continue
@@ -332,6 +581,8 @@ def _resolve_client_config(payload: Dict[str, Any]) -> TranslatorConfig:
         target_language=target_language,
         concurrency=concurrency,
         timeout_sec=timeout_sec,
+        max_requests_per_minute=settings.ARXIV_TRANSLATE_MAX_REQUESTS_PER_MINUTE,
+        max_tokens_per_minute=settings.ARXIV_TRANSLATE_MAX_TOKENS_PER_MINUTE,
     )
 
 
@@ -340,25 +591,124 @@ def _is_chinese_target(target_language: str) -> bool:
     return ("中文" in lang) or ("chinese" in lang) or ("zh" == lang)
 
 
+def _link_or_copy(src: str, dst: str) -> str:
+    """
+    Hardlink read-only assets (figures, .bib, .sty...). Tex files and anything
+    sharing a stem with one (.bbl, .aux, a prebuilt .pdf) get a real copy,
+    because translation and latex rewrite those in place.
+    """
+    src_path = Path(src)
+    if src_path.suffix.lower() != ".tex" and not src_path.with_suffix(".tex").exists():
+        try:
+            os.link(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
 def _copy_project_tree(src_root: Path, dst_root: Path) -> None:
     if dst_root.exists():
         shutil.rmtree(dst_root)
-    shutil.copytree(src_root, dst_root)
+    shutil.copytree(src_root, dst_root, copy_function=_link_or_copy)
+
+
+def _plan_file(raw: bytes, max_tokens: int) -> List[LatexSegment]:
+    """Process-pool worker: decode one tex file like read_text() and segment it."""
+    raw_content = raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+    content = strip_latex_comments(raw_content)
+    return build_translation_segments(content, max_tokens=max_tokens)
+
+
+def _get_plan_executor() -> Optional[ProcessPoolExecutor]:
+    global _plan_executor, _plan_executor_failed
+    with _plan_executor_lock:
+        if _plan_executor is None and not _plan_executor_failed:
+            try:
+                _plan_executor = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 2))
+            except (OSError, NotImplementedError):
+                # No usable multiprocessing here; plan on the default thread pool.
+                _plan_executor_failed = True
+        return _plan_executor
+
+
+def _discard_plan_executor(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next job starts a fresh one."""
+    global _plan_executor
+    with _plan_executor_lock:
+        if _plan_executor is executor:
+            _plan_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _plan_tex_files(
+    project_root: Path,
+    tex_files: List[Path],
+    max_tokens: int,
+) -> Dict[str, List[LatexSegment]]:
+    loop = asyncio.get_running_loop()
+    executor = _get_plan_executor()
+
+    async def _plan(rel: Path) -> Tuple[str, List[LatexSegment]]:
+        raw = await asyncio.to_thread((project_root / rel).read_bytes)
+        try:
+            segments = await loop.run_in_executor(executor, _plan_file, raw, max_tokens)
+        except BrokenProcessPool:
+            if executor is not None:
+                _discard_plan_executor(executor)
+            segments = await asyncio.to_thread(_plan_file, raw, max_tokens)
+        return rel.as_posix(), segments
+
+    return dict(await asyncio.gather(*(_plan(rel) for rel in tex_files)))
 
 
 def _assemble_segments(segments: list[dict]) -> str:
-    return "".join(seg["current"] for seg in segments)
+    return "".join([seg["current"] for seg in segments])
 
 
-def _recompute_segment_lines(segments: list[dict]) -> None:
+def _recompute_segment_lines(segments: list[dict]) -> Tuple[List[int], List[int]]:
+    """Renumber segments; returns the (sorted) start_line and end_line columns."""
+    start_lines: List[int] = []
+    end_lines: List[int] = []
     line_cursor = 1
     for seg in segments:
         seg["start_line"] = line_cursor
-        line_cursor += seg["current"].count("\n")
+        start_lines.append(line_cursor)
+        line_cursor += seg["line_count"]
         seg["end_line"] = line_cursor
+        end_lines.append(line_cursor)
+    return start_lines, end_lines
+
+
+def _nearest_changed_segment(segments: list[dict], start_lines: List[int], line: int) -> Optional[dict]:
+    """
+    Translated segment closest to line, earliest on ties. Walks outwards from
+    the bisect position; distances only grow in both directions.
+    """
+    idx = bisect_right(start_lines, line)
+    best: Optional[dict] = None
+    best_distance = 0
+    for i in range(idx - 1, -1, -1):
+        seg = segments[i]
+        distance = 0 if seg["end_line"] >= line else line - seg["end_line"]
+        if best is not None and distance > best_distance:
+            break
+        if seg["translatable"] and seg["current"] != seg["original"]:
+            best, best_distance = seg, distance
+    for i in range(idx, len(segments)):
+        seg = segments[i]
+        if best is not None and seg["start_line"] - line >= best_distance:
+            break
+        if seg["translatable"] and seg["current"] != seg["original"]:
+            return seg
+    return best
 
 
-def _find_file_state(file_states: Dict[str, Dict[str, Any]], error_file_rel: str) -> Optional[Dict[str, Any]]:
+def _find_file_state(
+    file_states: Dict[str, Dict[str, Any]],
+    error_file_rel: str,
+    file_states_by_basename: Optional[Dict[str, List[str]]] = None,
+) -> Optional[Dict[str, Any]]:
     normalized = str(error_file_rel).replace("\\", "/")
     if normalized in file_states:
         return file_states[normalized]
@@ -369,6 +719,9 @@ def _find_file_state(file_states: Dict[str, Dict[str, Any]], error_file_rel: str
         return file_states[alt]
 
     basename = as_path.name
+    if file_states_by_basename is not None:
+        keys = file_states_by_basename.get(basename) or []
+        return file_states[keys[0]] if len(keys) == 1 else None
     candidates = [v for k, v in file_states.items() if Path(k).name == basename]
     if len(candidates) == 1:
         return candidates[0]
@@ -378,12 +731,13 @@ def _find_file_state(file_states: Dict[str, Dict[str, Any]], error_file_rel: str
 def _repair_file_state(
     *,
     file_states: Dict[str, Dict[str, Any]],
+    file_states_by_basename: Optional[Dict[str, List[str]]] = None,
     translated_root: Path,
     error_file_rel: str,
     error_line: int,
     window: int,
 ) -> bool:
-    state = _find_file_state(file_states, error_file_rel)
+    state = _find_file_state(file_states, error_file_rel, file_states_by_basename)
     if not state:
         return False
 
@@ -393,42 +747,33 @@ def _repair_file_state(
     changed = 0
 
     segments = state["segments"]
-    for seg in segments:
+    start_lines: List[int] = state["start_lines"]
+    end_lines: List[int] = state["end_lines"]
+    first = bisect_left(end_lines, lo)
+    last = bisect_right(start_lines, hi)
+    for seg in segments[first:last]:
         if not seg["translatable"]:
             continue
         if seg["current"] == seg["original"]:
             continue
-        if seg["end_line"] < lo or seg["start_line"] > hi:
-            continue
         seg["current"] = seg["original"]
+        seg["line_count"] = seg["original_line_count"]
         changed += 1
 
     if changed == 0:
-        candidates = [
-            seg
-            for seg in segments
-            if seg["translatable"] and (seg["current"] != seg["original"])
-        ]
-        if not candidates:
+        nearest = _nearest_changed_segment(segments, start_lines, line)
+        if nearest is None:
             return False
-
-        def _distance(s: dict) -> int:
-            if s["start_line"] <= line <= s["end_line"]:
-                return 0
-            if line < s["start_line"]:
-                return s["start_line"] - line
-            return line - s["end_line"]
-
-        nearest = min(candidates, key=_distance)
         nearest["current"] = nearest["original"]
+        nearest["line_count"] = nearest["original_line_count"]
         changed = 1
 
-    _recompute_segment_lines(segments)
+    state["start_lines"], state["end_lines"] = _recompute_segment_lines(segments)
     rel_path: Path = state["rel"]
     out_file = translated_root / rel_path
     assembled = _assemble_segments(segments)
     assembled = ensure_section_title_bold(assembled)
-    out_file.write_text(assembled, encoding="utf-8")
+    out_file.write_bytes(assembled.encode("utf-8"))
     state["repaired_segments"] = int(state.get("repaired_segments", 0)) + changed
     return True
 
@@ -474,13 +819,24 @@ async def create_job(payload: Dict[str, Any]) -> Dict[str, Any]:
         },
         "_payload": dict(payload),
         "_task": None,
+        "_download_task": None,
         "_paths": build_job_paths(settings.ARXIV_TRANSLATE_DATA_DIR, canonical_id, job_id),
         "_cancel_requested": False,
     }
 
     _append_step(job, key="queued", status="done", message=f"任务已创建：arXiv:{paper_id}")
     ensure_job_dirs(job["_paths"])
-    _persist_job(job)
+    # Start fetching the source right away; _run_job awaits this task.
+    job["_download_task"] = asyncio.create_task(
+        asyncio.to_thread(
+            download_arxiv_source_archive,
+            paper_id=paper_id,
+            canonical_id=canonical_id,
+            output_path=job["_paths"].source_archive,
+            timeout_sec=DEFAULT_DOWNLOAD_TIMEOUT_SEC,
+        )
+    )
+    await _persist_job_async(job)
 
     async with _jobs_lock:
         _jobs[job_id] = job
@@ -504,16 +860,17 @@ async def get_job(job_id: str) -> Dict[str, Any]:
 async def cancel_job(job_id: str) -> Dict[str, Any]:
     async with _jobs_lock:
         job = _get_job(job_id)
-        if job["status"] in {"succeeded", "failed", "cancelled"}:
+        if job["status"] in _TERMINAL_STATUSES:
             return _snapshot(job)
         job["_cancel_requested"] = True
-        task = job.get("_task")
-        if task and not task.done():
-            task.cancel()
+        for key in ("_task", "_download_task"):
+            task = job.get(key)
+            if task and not task.done():
+                task.cancel()
         job["status"] = "cancelled"
         _append_step(job, key="cancel", status="done", message="用户取消任务。")
-        _persist_job(job)
-        return _snapshot(job)
+    await _persist_job_async(job)
+    return _snapshot(job)
 
 
 def _normalize_status_set(statuses: Optional[List[str]]) -> set[str]:
@@ -547,7 +904,7 @@ def _make_history_row_from_snapshot(snap: Dict[str, Any], *, paths: Optional[Job
     title = str(meta.get("paper_title") or "")
     if (not title) and paths and ("main_tex" in meta):
         try:
-            title = _extract_paper_title_from_main_tex(paths.extract_dir, Path(str(meta["main_tex"])))
+            title = _history_title(paths.extract_dir, Path(str(meta["main_tex"])))
         except Exception:
             title = ""
     task_name = str(meta.get("task_name") or _build_task_name(paper_id, title))
@@ -589,29 +946,85 @@ def _make_history_row_from_snapshot(snap: Dict[str, Any], *, paths: Optional[Job
     }
 
 
+def _disk_history_row(
+    job_json: Path,
+    mtime_ns: int,
+    title_writes: Optional[List[Tuple[JobPaths, Dict[str, Any]]]] = None,
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Return (lowercased status, history row) for a job.json, reusing the
+    previous result while the file's mtime is unchanged. A title found by
+    _history_title is queued on `title_writes` for the caller to persist.
+    """
+    key = str(job_json)
+    with _disk_cache_lock:
+        cached = _disk_cache_get(_history_row_cache, key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+
+    status = ""
+    row: Optional[Dict[str, Any]] = None
+    snap = _load_disk_job_snapshot(job_json)
+    if snap:
+        status = str(snap.get("status") or "").lower()
+        paths = _job_paths_from_job_json(job_json)
+        row = _make_history_row_from_snapshot(snap, paths=paths)
+        pending = _extracted_title_payload(snap, row, paths)
+        if pending is not None and title_writes is not None:
+            title_writes.append(pending)
+    with _disk_cache_lock:
+        _disk_cache_put(_history_row_cache, key, (mtime_ns, status, row), _HISTORY_ROW_CACHE_SIZE)
+    return status, row
+
+
+def _extracted_title_payload(
+    snap: Dict[str, Any],
+    row: Optional[Dict[str, Any]],
+    paths: Optional[JobPaths],
+) -> Optional[Tuple[JobPaths, Dict[str, Any]]]:
+    """job.json payload carrying a title found by _history_title, for finished jobs only."""
+    title = (row or {}).get("paper_title")
+    meta = snap.get("meta") or {}
+    if not title or meta.get("paper_title") or not paths:
+        return None
+    if str(snap.get("status") or "") not in _TERMINAL_STATUSES:
+        return None
+    payload = dict(snap)
+    payload["meta"] = {**meta, "paper_title": title}
+    return paths, payload
+
+
+def _store_extracted_titles(title_writes: List[Tuple[JobPaths, Dict[str, Any]]]) -> None:
+    for paths, payload in title_writes:
+        try:
+            save_job_json(paths, payload)
+        except OSError:
+            pass
+
+
 async def list_jobs(limit: int = 30, statuses: Optional[List[str]] = None) -> Dict[str, Any]:
     max_items = min(max(1, int(limit)), 200)
     allowed_status = _normalize_status_set(statuses)
     base_dir = Path(settings.ARXIV_TRANSLATE_DATA_DIR)
 
     rows_by_id: Dict[str, Dict[str, Any]] = {}
+    title_writes: List[Tuple[JobPaths, Dict[str, Any]]] = []
 
     if base_dir.exists():
-        for job_json in base_dir.glob("*/*/job.json"):
-            snap = _load_disk_job_snapshot(job_json)
-            if not snap:
-                continue
-            status = str(snap.get("status") or "").lower()
+        for job_json, mtime_ns in _iter_job_json(base_dir):
+            status, row = _disk_history_row(job_json, mtime_ns, title_writes)
             if status not in allowed_status:
                 continue
-            paths = _job_paths_from_job_json(job_json)
-            row = _make_history_row_from_snapshot(snap, paths=paths)
             if not row or not row.get("job_id"):
                 continue
             rows_by_id[row["job_id"]] = row
 
     async with _jobs_lock:
         live_jobs = list(_jobs.values())
+        # Live jobs persist themselves; a disk snapshot must not overwrite them.
+        title_writes = [(p, payload) for p, payload in title_writes if payload.get("job_id") not in _jobs]
+    if title_writes:
+        await asyncio.to_thread(_store_extracted_titles, title_writes)
 
     for job in live_jobs:
         snap = _snapshot(job)
@@ -626,9 +1039,8 @@ async def list_jobs(limit: int = 30, statuses: Optional[List[str]] = None) -> Di
         if not prev or str(row.get("updated_at", "")) >= str(prev.get("updated_at", "")):
             rows_by_id[row["job_id"]] = row
 
-    rows = list(rows_by_id.values())
-    rows.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-    return {"items": rows[:max_items]}
+    rows = heapq.nlargest(max_items, rows_by_id.values(), key=lambda x: x.get("updated_at", ""))
+    return {"items": rows}
 
 
 async def _run_job(job_id: str) -> None:
@@ -641,21 +1053,25 @@ async def _run_job(job_id: str) -> None:
     try:
         job["status"] = "running"
         _append_step(job, key="start", status="running", message="开始执行 arXiv 论文精细翻译。")
-        _persist_job(job)
+        await _persist_job_async(job)
 
         _append_step(job, key="download", status="running", message="正在下载 arXiv 源码包...")
-        _persist_job(job)
-        source_url = await asyncio.to_thread(
-            download_arxiv_source_archive,
-            paper_id=paper_id,
-            canonical_id=canonical_id,
-            output_path=paths.source_archive,
-            timeout_sec=DEFAULT_DOWNLOAD_TIMEOUT_SEC,
-        )
+        await _persist_job_async(job)
+        download_task = job.get("_download_task")
+        if download_task is not None:
+            source_url = await download_task
+        else:
+            source_url = await asyncio.to_thread(
+                download_arxiv_source_archive,
+                paper_id=paper_id,
+                canonical_id=canonical_id,
+                output_path=paths.source_archive,
+                timeout_sec=DEFAULT_DOWNLOAD_TIMEOUT_SEC,
+            )
         _append_step(job, key="download", status="done", message=f"源码下载完成：{source_url}")
 
         _append_step(job, key="extract", status="running", message="正在解压源码包...")
-        _persist_job(job)
+        await _persist_job_async(job)
         await asyncio.to_thread(extract_source_archive, paths.source_archive, paths.extract_dir)
         project_root = await asyncio.to_thread(normalize_project_root, paths.extract_dir)
         tex_files = await asyncio.to_thread(discover_tex_files, project_root)
@@ -672,26 +1088,26 @@ async def _run_job(job_id: str) -> None:
             status="done",
             message=f"源码解压完成，识别主文件：{main_tex_rel}",
         )
-        _persist_job(job)
+        await _persist_job_async(job)
 
         _append_step(job, key="prepare", status="running", message="正在准备翻译工作目录...")
         await asyncio.to_thread(_copy_project_tree, project_root, paths.translated_dir)
         _append_step(job, key="prepare", status="done", message="工作目录准备完成。")
-        _persist_job(job)
+        await _persist_job_async(job)
 
         translator_cfg = _resolve_client_config(payload)
+        is_chinese = _is_chinese_target(translator_cfg.target_language)
         extra_prompt = (payload.get("extra_prompt") or "").strip()
         chunk_max_tokens = int(payload.get("chunk_max_tokens") or DEFAULT_CHUNK_MAX_TOKENS)
         max_chunks = DEFAULT_MAX_CHUNKS
 
-        planned_segments: Dict[str, List[LatexSegment]] = {}
-        total_chunks = 0
-        for rel in tex_files:
-            raw_content = (project_root / rel).read_text(encoding="utf-8", errors="ignore")
-            content = strip_latex_comments(raw_content)
-            segments = build_translation_segments(content, max_tokens=chunk_max_tokens)
-            planned_segments[rel.as_posix()] = segments
-            total_chunks += sum(1 for s in segments if s.translatable and s.text.strip())
+        planned_segments = await _plan_tex_files(project_root, tex_files, chunk_max_tokens)
+        total_chunks = sum(
+            1
+            for segments in planned_segments.values()
+            for s in segments
+            if s.translatable and s.text.strip()
+        )
 
         if total_chunks <= 0:
             raise RuntimeError("未生成可翻译分片。")
@@ -699,7 +1115,7 @@ async def _run_job(job_id: str) -> None:
             raise RuntimeError(f"论文分片过多（{total_chunks} > {max_chunks}），请提高 chunk token 大小或换更小论文。")
 
         job["meta"]["total_chunks"] = total_chunks
-        _persist_job(job)
+        await _persist_job_async(job)
 
         _append_step(
             job,
@@ -707,9 +1123,10 @@ async def _run_job(job_id: str) -> None:
             status="running",
             message=f"开始翻译 LaTeX 内容，共 {len(tex_files)} 个 tex 文件，{total_chunks} 个分片。",
         )
-        _persist_job(job)
+        await _persist_job_async(job)
 
         file_states: Dict[str, Dict[str, Any]] = {}
+        file_states_by_basename: Dict[str, List[str]] = {}
         translated_done = 0
         for index, rel in enumerate(tex_files, start=1):
             if job.get("_cancel_requested"):
@@ -721,16 +1138,19 @@ async def _run_job(job_id: str) -> None:
 
             segments = planned_segments.get(rel.as_posix())
             if segments is None:
-                source_text = strip_latex_comments(src_file.read_text(encoding="utf-8", errors="ignore"))
-                segments = build_translation_segments(source_text, max_tokens=chunk_max_tokens)
+                raw = await asyncio.to_thread(src_file.read_bytes)
+                segments = await asyncio.to_thread(_plan_file, raw, chunk_max_tokens)
 
             state_segments: list[dict] = []
             chunks: list[str] = []
             translatable_indices: list[int] = []
             for seg in segments:
+                line_count = seg.text.count("\n")
                 seg_state = {
                     "original": seg.text,
                     "current": seg.text,
+                    "line_count": line_count,
+                    "original_line_count": line_count,
                     "translatable": bool(seg.translatable),
                     "start_line": seg.start_line,
                     "end_line": seg.end_line,
@@ -745,7 +1165,7 @@ async def _run_job(job_id: str) -> None:
                     nonlocal translated_done
                     job["meta"]["translated_chunks"] = translated_done + done
                     job["updated_at"] = _now_iso()
-                    _persist_job(job)
+                    await _persist_job_async(job, throttle=True)
 
                 _append_step(
                     job,
@@ -753,20 +1173,27 @@ async def _run_job(job_id: str) -> None:
                     status="running",
                     message=f"正在翻译文件 {index}/{len(tex_files)}：{rel}",
                 )
-                _persist_job(job)
+                await _persist_job_async(job)
 
                 translated_chunks = await translate_chunks(
                     chunks,
                     translator_cfg,
                     extra_instruction=extra_prompt,
                     on_progress=_on_progress,
+                    cache=_translation_cache,
                 )
                 for seg_idx, translated in zip(translatable_indices, translated_chunks):
                     original = state_segments[seg_idx]["original"]
+                    if translated == original:
+                        # Unchanged round trip: state already holds the original.
+                        continue
                     guarded = guard_translated_segment(original, translated)
-                    if guarded == original and translated.strip() and translated.strip() != original.strip():
-                        job["meta"]["guard_fallback_chunks"] = int(job["meta"].get("guard_fallback_chunks", 0)) + 1
+                    if guarded == original:
+                        translated_stripped = translated.strip()
+                        if translated_stripped and translated_stripped != original.strip():
+                            job["meta"]["guard_fallback_chunks"] = int(job["meta"].get("guard_fallback_chunks", 0)) + 1
                     state_segments[seg_idx]["current"] = guarded
+                    state_segments[seg_idx]["line_count"] = guarded.count("\n")
                 translated_done += len(chunks)
                 job["meta"]["translated_chunks"] = translated_done
                 _append_step(
@@ -775,34 +1202,37 @@ async def _run_job(job_id: str) -> None:
                     status="done",
                     message=f"文件翻译完成：{rel}",
                 )
-                _persist_job(job)
+                await _persist_job_async(job)
 
-            _recompute_segment_lines(state_segments)
+            start_lines, end_lines = _recompute_segment_lines(state_segments)
             assembled = _assemble_segments(state_segments)
             assembled = ensure_section_title_bold(assembled)
-            dst_file.write_text(assembled, encoding="utf-8")
+            dst_file.write_bytes(assembled.encode("utf-8"))
             file_states[rel.as_posix()] = {
                 "rel": rel,
                 "segments": state_segments,
+                "start_lines": start_lines,
+                "end_lines": end_lines,
                 "repaired_segments": 0,
             }
+            file_states_by_basename.setdefault(rel.name, []).append(rel.as_posix())
 
-        if _is_chinese_target(translator_cfg.target_language):
+        if is_chinese:
             main_tex_abs = paths.translated_dir / main_tex_rel
             injected = await asyncio.to_thread(ensure_ctex_support, main_tex_abs)
             if injected:
                 _append_step(job, key="prepare_chinese", status="done", message="已自动注入 ctex 中文支持。")
-                _persist_job(job)
+                _schedule_persist(job)
 
         _append_step(job, key="compile", status="running", message="正在编译翻译后的 PDF ...")
-        _persist_job(job)
+        _schedule_persist(job)
 
         max_compile_tries = int(payload.get("max_compile_tries") or DEFAULT_MAX_COMPILE_TRIES)
         max_compile_tries = min(max(1, max_compile_tries), DEFAULT_MAX_COMPILE_TRIES)
         compile_result: Optional[Dict[str, Any]] = None
         compile_success = False
         force_compiler: Optional[str] = None
-        if _is_chinese_target(translator_cfg.target_language):
+        if is_chinese:
             if command_exists("xelatex"):
                 force_compiler = "xelatex"
             else:
@@ -812,9 +1242,6 @@ async def _run_job(job_id: str) -> None:
             if job.get("_cancel_requested"):
                 raise asyncio.CancelledError()
 
-            if _is_chinese_target(translator_cfg.target_language):
-                await asyncio.to_thread(ensure_ctex_support, paths.translated_dir / main_tex_rel)
-
             job["meta"]["compile_attempts"] = attempt
             _append_step(
                 job,
@@ -822,7 +1249,7 @@ async def _run_job(job_id: str) -> None:
                 status="running",
                 message=f"尝试第 {attempt}/{max_compile_tries} 次编译...",
             )
-            _persist_job(job)
+            _schedule_persist(job)
 
             compile_result = await asyncio.to_thread(
                 compile_latex_project,
@@ -834,6 +1261,7 @@ async def _run_job(job_id: str) -> None:
                 attempt_index=attempt,
                 attempt_total=max_compile_tries,
                 force_compiler=force_compiler,
+                ensure_cjk=is_chinese,
             )
 
             if compile_result.get("compile_ok"):
@@ -850,6 +1278,7 @@ async def _run_job(job_id: str) -> None:
             repaired = await asyncio.to_thread(
                 _repair_file_state,
                 file_states=file_states,
+                file_states_by_basename=file_states_by_basename,
                 translated_root=paths.translated_dir,
                 error_file_rel=err_rel,
                 error_line=err_line,
@@ -862,7 +1291,7 @@ async def _run_job(job_id: str) -> None:
                     status="running",
                     message=f"第 {attempt} 次编译失败，已回退 {err_rel}:{err_line} 附近译文并重试。",
                 )
-                _persist_job(job)
+                _schedule_persist(job)
                 continue
 
             _append_step(
@@ -871,7 +1300,7 @@ async def _run_job(job_id: str) -> None:
                 status="error",
                 message=f"第 {attempt} 次编译失败，未找到可回退片段（{err_rel}:{err_line}）。",
             )
-            _persist_job(job)
+            _schedule_persist(job)
             break
 
         if not compile_success or not compile_result:
@@ -896,7 +1325,7 @@ async def _run_job(job_id: str) -> None:
             status="done",
             message=f"PDF 编译完成（{compile_result['compiler']}，第 {job['meta']['compile_attempts']} 次通过）。",
         )
-        _persist_job(job)
+        _schedule_persist(job)
 
         _append_step(job, key="pack", status="running", message="正在打包翻译项目...")
         output_zip = await asyncio.to_thread(
@@ -927,14 +1356,14 @@ async def _run_job(job_id: str) -> None:
 
         job["status"] = "succeeded"
         _append_step(job, key="done", status="done", message="任务完成，请下载译文 PDF。")
-        _persist_job(job)
+        await _persist_job_async(job)
     except asyncio.CancelledError:
         job["status"] = "cancelled"
         _append_step(job, key="cancel", status="done", message="任务已取消。")
-        _persist_job(job)
+        await _persist_job_async(job)
     except Exception as exc:
         job["status"] = "failed"
         job["error"] = str(exc)
         _append_step(job, key="error", status="error", message=f"任务失败：{exc}")
         job["meta"]["traceback"] = traceback.format_exc(limit=10)
-        _persist_job(job)
+        await _persist_job_async(job)
@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
+import hashlib
+import os
 import re
+import threading
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class LatexSegment:
     text: str
     translatable: bool
@@ -40,58 +47,177 @@ def estimate_token_count(text: str) -> int:
     if enc is None:
         return max(1, len(text) // 4)
     try:
-        return len(enc.encode(text, disallowed_special=()))
+        return len(enc.encode_ordinary(text))
     except Exception:
         return max(1, len(text) // 4)
 
 
+def estimate_token_counts(texts: List[str]) -> List[int]:
+    """Token counts for many texts with one batched tokenizer call."""
+    enc = _get_encoder()
+    if enc is None or not texts:
+        return [max(1, len(text) // 4) for text in texts]
+    try:
+        batches = enc.encode_ordinary_batch(texts, num_threads=min(8, os.cpu_count() or 1))
+    except Exception:
+        return [estimate_token_count(text) for text in texts]
+    return [len(ids) for ids in batches]
+
+
+def _within_token_limit_by_size(text: str, max_tokens: int) -> bool:
+    """
+    Every BPE token covers at least one UTF-8 byte, so a text of at most
+    max_tokens bytes cannot exceed max_tokens tokens; no encode needed.
+    """
+    if len(text) > max_tokens:
+        return False
+    return text.isascii() or len(text.encode("utf-8")) <= max_tokens
+
+
+_INLINE_COMMENT_RE = re.compile(r"(?m)(?<!\\)%.*$")
+# Unescaped "%" to end of line; starts with a literal so re can jump between hits.
+_COMMENT_TAIL_RE = re.compile(r"%(?<!\\%)[^\n]*")
+# Line boundaries str.splitlines() honours besides "\n".
+_OTHER_LINE_BREAKS = ("\r", "\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
 def strip_latex_comments(text: str) -> str:
     """
     Remove LaTeX comments before segmentation (aligned with GPT-Academic rm_comments):
     - drop full-line comments
     - remove inline comments that start with unescaped %
     """
+    if not any(sep in text for sep in _OTHER_LINE_BREAKS):
+        return _strip_comments_lf(text)
     lines: List[str] = []
     for line in text.splitlines():
         if line.lstrip().startswith("%"):
             continue
         lines.append(line)
     no_full_line = "\n".join(lines)
-    return re.sub(r"(?m)(?<!\\)%.*$", "", no_full_line)
+    return _INLINE_COMMENT_RE.sub("", no_full_line)
+
+
+def _strip_comments_lf(text: str) -> str:
+    """
+    strip_latex_comments for LF-only text: visits each comment instead of
+    splitting every line, with the same output as the splitlines() path.
+    """
+    if text.endswith("\n"):
+        text = text[:-1]
+    parts: List[str] = []
+    cursor = 0
+    for m in _COMMENT_TAIL_RE.finditer(text):
+        start = m.start()
+        line_start = text.rfind("\n", 0, start) + 1
+        if line_start == start or text[line_start:start].isspace():
+            # Full-line comment: drop the whole line and its newline.
+            parts.append(text[cursor:line_start])
+            cursor = m.end() + 1
+        else:
+            parts.append(text[cursor:start])
+            cursor = m.end()
+    parts.append(text[cursor:])
+    out = "".join(parts)
+    if cursor > len(text) and out.endswith("\n"):
+        # Last line was a full-line comment; splitlines() would not leave its separator.
+        out = out[:-1]
+    return out
+
+
+_PREAMBLE_END_RE = re.compile(r"\\maketitle|\\begin\{document\}")
+_BEGIN_DOCUMENT_RE = re.compile(r"\\begin\{document\}")
+_MAKETITLE_RE = re.compile(r"\\maketitle\b")
+_ABSTRACT_ENV_RE = re.compile(r"\\begin\{abstract\}(.*?)\\end\{abstract\}", re.DOTALL)
+_ABSTRACT_CMD_RE = re.compile(r"\\abstract\{(.*?)\}", re.DOTALL)
+_CAPTION_CMD_RE = re.compile(r"\\caption\{(.*?)\}", re.DOTALL)
+_BEGIN_END_BLOCK_RE = re.compile(r"\\begin\{([a-zA-Z\*]+)\}(.*?)\\end\{\1\}", re.DOTALL)
+
+# Regions kept verbatim, as (compiled pattern, max_lines).
+_PRESERVE_RULES = tuple(
+    (re.compile(pattern, flags), max_lines)
+    for pattern, flags, max_lines in [
+        (r"\\iffalse(.*?)\\fi", re.DOTALL, None),
+        (r"\$\$([^$]+)\$\$", re.DOTALL, None),
+        (r"\\\[.*?\\\]", re.DOTALL, None),
+        (r"\\section\*?\{.*?\}", 0, None),
+        (r"\\subsection\*?\{.*?\}", 0, None),
+        (r"\\subsubsection\*?\{.*?\}", 0, None),
+        (r"\\bibliography\{.*?\}", 0, None),
+        (r"\\bibliographystyle\{.*?\}", 0, None),
+        (r"\\begin\{thebibliography\}.*?\\end\{thebibliography\}", re.DOTALL, None),
+        (r"\\begin\{lstlisting\}.*?\\end\{lstlisting\}", re.DOTALL, None),
+        (r"\\begin\{algorithm\}.*?\\end\{algorithm\}", re.DOTALL, None),
+        (r"\\begin\{wraptable\}.*?\\end\{wraptable\}", re.DOTALL, None),
+        (r"\\begin\{wrapfigure\*?\}.*?\\end\{wrapfigure\*?\}", re.DOTALL, None),
+        (r"\\begin\{figure\*?\}.*?\\end\{figure\*?\}", re.DOTALL, None),
+        (r"\\begin\{table\*?\}.*?\\end\{table\*?\}", re.DOTALL, None),
+        (r"\\begin\{minipage\*?\}.*?\\end\{minipage\*?\}", re.DOTALL, None),
+        (r"\\begin\{multline\*?\}.*?\\end\{multline\*?\}", re.DOTALL, None),
+        (r"\\begin\{align\*?\}.*?\\end\{align\*?\}", re.DOTALL, None),
+        (r"\\begin\{equation\*?\}.*?\\end\{equation\*?\}", re.DOTALL, None),
+        (r"\\includepdf\[[^\]]*\]\{[^}]*\}", 0, None),
+        (r"\\(clearpage|newpage|appendix|tableofcontents)\b", 0, None),
+        (r"\\include\{[^}]*\}", 0, None),
+        (r"\\vspace\{.*?\}", 0, None),
+        (r"\\hspace\{.*?\}", 0, None),
+        (r"\\label\{.*?\}", 0, None),
+        (r"\\begin\{[^}]*\}", 0, None),
+        (r"\\end\{[^}]*\}", 0, None),
+        (r"\\item(?:\[[^\]]*\])?\s*", 0, None),
+        (r"\\pdfinfo\s*\{.*?\}", re.DOTALL, None),
+    ]
+)
 
 
-def _mark_range(mask: List[bool], start: int, end: int, value: bool) -> None:
+def _mark_range(mask: np.ndarray, start: int, end: int, value: bool) -> None:
     s = max(0, int(start))
     e = min(len(mask), int(end))
     if s >= e:
         return
-    mask[s:e] = [value] * (e - s)
+    mask[s:e] = value
 
 
 def _mark_pattern(
     text: str,
-    mask: List[bool],
-    pattern: str,
+    mask: np.ndarray,
+    pattern: re.Pattern[str],
     *,
-    flags: int = 0,
     value: bool = False,
     max_lines: int | None = None,
 ) -> None:
-    for m in re.finditer(pattern, text, flags):
+    for m in pattern.finditer(text):
         if max_lines is not None and m.group(0).count("\n") >= max_lines:
             continue
         _mark_range(mask, m.start(), m.end(), value)
 
 
+def _find_closing_brace(text: str, pos: int, depth: int = 1, limit: Optional[int] = None) -> int:
+    """
+    Index of the "}" that closes ``depth`` already-open braces, scanning
+    text[pos:limit]; -1 if it is not reached. Jumps brace to brace via
+    str.find/str.count instead of walking characters.
+    """
+    end = len(text) if limit is None else min(limit, len(text))
+    while pos < end:
+        close = text.find("}", pos, end)
+        if close < 0:
+            return -1
+        depth += text.count("{", pos, close) - 1
+        if depth == 0:
+            return close
+        pos = close + 1
+    return -1
+
+
 def _unmask_group(
     text: str,
-    mask: List[bool],
-    pattern: str,
+    mask: np.ndarray,
+    pattern: re.Pattern[str],
     *,
-    flags: int = 0,
     group: int = 1,
 ) -> None:
-    for m in re.finditer(pattern, text, flags):
+    for m in pattern.finditer(text):
         if group > (m.lastindex or 0):
             continue
         start, end = m.span(group)
@@ -100,44 +226,32 @@ def _unmask_group(
 
 def _unmask_group_careful_brace(
     text: str,
-    mask: List[bool],
-    pattern: str,
+    mask: np.ndarray,
+    pattern: re.Pattern[str],
     *,
-    flags: int = 0,
     group: int = 1,
 ) -> None:
     """
     Similar to GPT-Academic reverse_forbidden_text_careful_brace:
     unmask the content group and keep wrapper preserved.
     """
-    compiled = re.compile(pattern, flags)
-    for m in compiled.finditer(text):
+    for m in pattern.finditer(text):
         if group > (m.lastindex or 0):
             continue
         begin = m.regs[group][0]
-        p = begin
-        brace_level = 0
-        for _ in range(1024 * 16):
-            if p >= len(text):
-                break
-            c = text[p]
-            if c == "}" and brace_level == 0:
-                break
-            if c == "{":
-                brace_level += 1
-            elif c == "}":
-                brace_level -= 1
-            p += 1
-        end = p
+        limit = begin + 1024 * 16
+        end = _find_closing_brace(text, begin, limit=limit)
+        if end < 0:
+            end = min(limit, len(text))
         _mark_range(mask, begin, end, True)
 
 
-def _mark_frontmatter_region(text: str, mask: List[bool]) -> None:
+def _mark_frontmatter_region(text: str, mask: np.ndarray) -> None:
     """
     Preserve title metadata area between document start and maketitle.
     """
-    begin_doc = re.search(r"\\begin\{document\}", text)
-    make_title = re.search(r"\\maketitle\b", text)
+    begin_doc = _BEGIN_DOCUMENT_RE.search(text)
+    make_title = _MAKETITLE_RE.search(text)
     if not begin_doc or not make_title:
         return
     if make_title.start() <= begin_doc.end():
@@ -148,126 +262,74 @@ def _mark_frontmatter_region(text: str, mask: List[bool]) -> None:
     _mark_range(mask, begin_doc.end(), make_title.end(), False)
 
 
-def _mark_command_blocks(text: str, mask: List[bool], commands: List[str]) -> None:
+_METADATA_CMDS = (
+    "title",
+    "author",
+    "date",
+    "thanks",
+    "institute",
+    "affiliation",
+    "affil",
+    "address",
+    "email",
+    "emails",
+    "icmltitle",
+    "icmlauthor",
+    "icmlaffiliation",
+    "icmlcorrespondingauthor",
+    "authornote",
+)
+# Supports optional stars and bracket options, e.g. \author[1]{...}; ends at the payload "{".
+_METADATA_CMD_RE = re.compile(
+    rf"\\(?:{'|'.join(re.escape(cmd) for cmd in _METADATA_CMDS)})\*?(?:\s*\[[^\]]*\])*\s*\{{",
+    re.DOTALL,
+)
+
+
+def _mark_command_blocks(text: str, mask: np.ndarray, pattern: re.Pattern[str] = _METADATA_CMD_RE) -> None:
     """
     Preserve whole command blocks for metadata commands with brace payload.
-    Supports optional stars and bracket options, e.g. \\author[1]{...}.
     """
-    if not commands:
-        return
-    cmd_alt = "|".join(re.escape(cmd) for cmd in commands)
-    pattern = re.compile(rf"\\(?:{cmd_alt})\*?(?:\s*\[[^\]]*\])*\s*\{{", re.DOTALL)
     for m in pattern.finditer(text):
-        matched = m.group(0)
-        brace_offset = matched.rfind("{")
-        if brace_offset < 0:
-            continue
-        begin = m.start()
-        p = m.start() + brace_offset
-        brace_level = 0
-        for _ in range(1024 * 32):
-            if p >= len(text):
-                break
-            c = text[p]
-            if c == "{":
-                brace_level += 1
-            elif c == "}":
-                brace_level -= 1
-                if brace_level == 0:
-                    p += 1
-                    break
-            p += 1
-        _mark_range(mask, begin, p, False)
+        open_pos = m.end() - 1
+        limit = open_pos + 1024 * 32
+        close = _find_closing_brace(text, open_pos + 1, limit=limit)
+        p = close + 1 if close >= 0 else min(limit, len(text))
+        _mark_range(mask, m.start(), p, False)
 
 
-def _build_translation_mask(text: str) -> List[bool]:
-    mask = [True] * len(text)
+def _build_translation_mask(text: str) -> np.ndarray:
+    """Per-character flags: True = translatable, False = keep verbatim."""
+    mask = np.ones(len(text), dtype=np.bool_)
 
     # Preserve preamble and title metadata region by default.
-    preamble_end = re.search(r"\\maketitle|\\begin\{document\}", text)
+    preamble_end = _PREAMBLE_END_RE.search(text)
     if preamble_end:
         _mark_range(mask, 0, preamble_end.end(), False)
     _mark_frontmatter_region(text, mask)
 
-    _mark_command_blocks(
-        text,
-        mask,
-        [
-            "title",
-            "author",
-            "date",
-            "thanks",
-            "institute",
-            "affiliation",
-            "affil",
-            "address",
-            "email",
-            "emails",
-            "icmltitle",
-            "icmlauthor",
-            "icmlaffiliation",
-            "icmlcorrespondingauthor",
-            "authornote",
-        ],
-    )
+    _mark_command_blocks(text, mask)
 
     _mark_short_begin_end_blocks(text, mask, limit_n_lines=42)
 
-    preserve_rules = [
-        (r"\\iffalse(.*?)\\fi", re.DOTALL, None),
-        (r"\$\$([^$]+)\$\$", re.DOTALL, None),
-        (r"\\\[.*?\\\]", re.DOTALL, None),
-        (r"\\section\*?\{.*?\}", 0, None),
-        (r"\\subsection\*?\{.*?\}", 0, None),
-        (r"\\subsubsection\*?\{.*?\}", 0, None),
-        (r"\\bibliography\{.*?\}", 0, None),
-        (r"\\bibliographystyle\{.*?\}", 0, None),
-        (r"\\begin\{thebibliography\}.*?\\end\{thebibliography\}", re.DOTALL, None),
-        (r"\\begin\{lstlisting\}.*?\\end\{lstlisting\}", re.DOTALL, None),
-        (r"\\begin\{algorithm\}.*?\\end\{algorithm\}", re.DOTALL, None),
-        (r"\\begin\{wraptable\}.*?\\end\{wraptable\}", re.DOTALL, None),
-        (r"\\begin\{wrapfigure\*?\}.*?\\end\{wrapfigure\*?\}", re.DOTALL, None),
-        (r"\\begin\{figure\*?\}.*?\\end\{figure\*?\}", re.DOTALL, None),
-        (r"\\begin\{table\*?\}.*?\\end\{table\*?\}", re.DOTALL, None),
-        (r"\\begin\{minipage\*?\}.*?\\end\{minipage\*?\}", re.DOTALL, None),
-        (r"\\begin\{multline\*?\}.*?\\end\{multline\*?\}", re.DOTALL, None),
-        (r"\\begin\{align\*?\}.*?\\end\{align\*?\}", re.DOTALL, None),
-        (r"\\begin\{equation\*?\}.*?\\end\{equation\*?\}", re.DOTALL, None),
-        (r"\\includepdf\[[^\]]*\]\{[^}]*\}", 0, None),
-        (r"\\(clearpage|newpage|appendix|tableofcontents)\b", 0, None),
-        (r"\\include\{[^}]*\}", 0, None),
-        (r"\\vspace\{.*?\}", 0, None),
-        (r"\\hspace\{.*?\}", 0, None),
-        (r"\\label\{.*?\}", 0, None),
-        (r"\\begin\{[^}]*\}", 0, None),
-        (r"\\end\{[^}]*\}", 0, None),
-        (r"\\item(?:\[[^\]]*\])?\s*", 0, None),
-        (r"\\pdfinfo\s*\{.*?\}", re.DOTALL, None),
-    ]
-
-    for pattern, flags, max_lines in preserve_rules:
-        _mark_pattern(text, mask, pattern, flags=flags, value=False, max_lines=max_lines)
+    # One pass per rule: matches of different rules may overlap or cross.
+    for pattern, max_lines in _PRESERVE_RULES:
+        _mark_pattern(text, mask, pattern, value=False, max_lines=max_lines)
 
     # Re-enable abstract/caption bodies for translation.
-    _unmask_group(
-        text,
-        mask,
-        r"\\begin\{abstract\}(.*?)\\end\{abstract\}",
-        flags=re.DOTALL,
-        group=1,
-    )
-    _unmask_group_careful_brace(text, mask, r"\\abstract\{(.*?)\}", flags=re.DOTALL, group=1)
-    _unmask_group_careful_brace(text, mask, r"\\caption\{(.*?)\}", flags=re.DOTALL, group=1)
+    _unmask_group(text, mask, _ABSTRACT_ENV_RE, group=1)
+    _unmask_group_careful_brace(text, mask, _ABSTRACT_CMD_RE, group=1)
+    _unmask_group_careful_brace(text, mask, _CAPTION_CMD_RE, group=1)
     return mask
 
 
-def _mark_short_begin_end_blocks(text: str, mask: List[bool], *, limit_n_lines: int = 42) -> None:
+def _mark_short_begin_end_blocks(text: str, mask: np.ndarray, *, limit_n_lines: int = 42) -> None:
     """
     Port of GPT-Academic set_forbidden_text_begin_end:
     recursively preserve short begin/end environments, but keep selected
     text-heavy environments expandable so inner structures can be handled.
     """
-    pattern = re.compile(r"\\begin\{([a-zA-Z\*]+)\}(.*?)\\end\{\1\}", re.DOTALL)
+    pattern = _BEGIN_END_BLOCK_RE
     white_list = {
         "document",
         "abstract",
@@ -310,25 +372,22 @@ def _post_process_chunks(chunks: List[tuple[str, bool]]) -> List[tuple[str, bool
     1) very short transform chunks are preserved
     2) adjacent chunks with same flag are merged
     """
-    adjusted: List[tuple[str, bool]] = []
+    merged: List[tuple[str, bool]] = []
+    run: List[str] = []
+    run_flag = False
     for text, translatable in chunks:
         flag = bool(translatable)
         if flag:
             core = text.strip("\n").strip()
             if len(core) < SHORT_SEGMENT_MIN_CHARS:
                 flag = False
-        adjusted.append((text, flag))
-
-    merged: List[tuple[str, bool]] = []
-    for text, flag in adjusted:
-        if not merged:
-            merged.append((text, flag))
-            continue
-        prev_text, prev_flag = merged[-1]
-        if prev_flag == flag:
-            merged[-1] = (prev_text + text, flag)
-        else:
-            merged.append((text, flag))
+        if run and flag != run_flag:
+            merged.append(("".join(run), run_flag))
+            run = []
+        run.append(text)
+        run_flag = flag
+    if run:
+        merged.append(("".join(run), run_flag))
     return merged
 
 
@@ -338,15 +397,13 @@ def segment_latex_text(text: str) -> List[LatexSegment]:
     mask = _build_translation_mask(text)
     raw_chunks: List[tuple[str, bool]] = []
 
-    i = 0
-    n = len(text)
-    while i < n:
-        flag = mask[i]
-        j = i + 1
-        while j < n and mask[j] == flag:
-            j += 1
-        raw_chunks.append((text[i:j], bool(flag)))
-        i = j
+    # Run boundaries are where the flag flips; flags alternate between runs.
+    edges = np.flatnonzero(mask[1:] != mask[:-1]) + 1
+    bounds = [0, *edges.tolist(), len(text)]
+    flag = bool(mask[0])
+    for start, end in zip(bounds, bounds[1:]):
+        raw_chunks.append((text[start:end], flag))
+        flag = not flag
 
     chunks = _post_process_chunks(raw_chunks)
     segments: List[LatexSegment] = []
@@ -367,8 +424,9 @@ def segment_latex_text(text: str) -> List[LatexSegment]:
     return segments
 
 
-def _pick_split_index(text: str, max_tokens: int) -> int:
-    total_tokens = estimate_token_count(text)
+def _pick_split_index(text: str, max_tokens: int, total_tokens: Optional[int] = None) -> int:
+    if total_tokens is None:
+        total_tokens = estimate_token_count(text)
     if total_tokens <= max_tokens or len(text) < 2:
         return -1
 
@@ -397,23 +455,61 @@ def _pick_split_index(text: str, max_tokens: int) -> int:
     return min(candidates, key=lambda x: abs(x - target))
 
 
-def _split_text_to_token_limit(text: str, max_tokens: int) -> List[str]:
+def _range_token_counter(text: str) -> Callable[[int, int], int]:
+    """
+    Encode text once and count tokens of any [start, end) slice from the token
+    start offsets. This approximates encoding the slice on its own: tokens
+    straddling either edge are counted whole, but BPE may split the slice's
+    edges differently, so the true count can be slightly higher or lower.
+    """
+    enc = _get_encoder()
+    if enc is not None:
+        try:
+            _, offsets = enc.decode_with_offsets(enc.encode_ordinary(text))
+        except Exception:
+            offsets = None
+        if offsets is not None:
+            return lambda start, end: bisect_left(offsets, end) - bisect_right(offsets, start) + 1
+    return lambda start, end: max(1, (end - start) // 4)
+
+
+def _split_text_to_token_limit(text: str, max_tokens: int, token_count: Optional[int] = None) -> List[str]:
     if not text:
         return []
-    if estimate_token_count(text) <= max_tokens:
+    if token_count is not None and token_count <= max_tokens:
         return [text]
+    count_range = _range_token_counter(text)
+    return _split_range_to_token_limit(text, 0, len(text), max_tokens, count_range)
 
-    split_idx = _pick_split_index(text, max_tokens)
-    if split_idx <= 0 or split_idx >= len(text):
-        split_idx = len(text) // 2
-    split_idx = min(max(1, split_idx), len(text) - 1)
 
-    left = text[:split_idx]
-    right = text[split_idx:]
-    if not left or not right:
-        return [text]
+def _split_range_to_token_limit(
+    text: str,
+    start: int,
+    end: int,
+    max_tokens: int,
+    count_range: Callable[[int, int], int],
+) -> List[str]:
+    out: List[str] = []
+    # Explicit worklist of [start, end) ranges; the left half is pushed last so
+    # pieces come out in document order.
+    stack = [(start, end)]
+    while stack:
+        start, end = stack.pop()
+        piece = text[start:end]
+        token_count = count_range(start, end)
+        if token_count <= max_tokens or len(piece) < 2:
+            out.append(piece)
+            continue
 
-    return _split_text_to_token_limit(left, max_tokens) + _split_text_to_token_limit(right, max_tokens)
+        split_idx = _pick_split_index(piece, max_tokens, token_count)
+        if split_idx <= 0 or split_idx >= len(piece):
+            split_idx = len(piece) // 2
+        split_idx = min(max(1, split_idx), len(piece) - 1)
+
+        mid = start + split_idx
+        stack.append((mid, end))
+        stack.append((start, mid))
+    return out
 
 
 def split_translatable_segments_by_token_limit(
@@ -423,13 +519,23 @@ def split_translatable_segments_by_token_limit(
 ) -> List[LatexSegment]:
     out: List[LatexSegment] = []
     token_limit = max(256, int(max_tokens))
+    oversized = [
+        seg.text
+        for seg in segments
+        if seg.translatable and not _within_token_limit_by_size(seg.text, token_limit)
+    ]
+    counts = dict(zip(oversized, estimate_token_counts(oversized)))
 
     for seg in segments:
-        if (not seg.translatable) or estimate_token_count(seg.text) <= token_limit:
+        if not seg.translatable:
+            out.append(seg)
+            continue
+        token_count = counts.get(seg.text, 0)
+        if token_count <= token_limit:
             out.append(seg)
             continue
 
-        chunks = _split_text_to_token_limit(seg.text, token_limit)
+        chunks = _split_text_to_token_limit(seg.text, token_limit, token_count)
         line_cursor = seg.start_line
         for chunk in chunks:
             line_inc = chunk.count("\n")
@@ -445,9 +551,30 @@ def split_translatable_segments_by_token_limit(
     return out
 
 
+_SEGMENTS_CACHE_SIZE = 32
+_segments_cache: "OrderedDict[Tuple[bytes, int], Tuple[LatexSegment, ...]]" = OrderedDict()
+_segments_cache_lock = threading.Lock()
+
+
 def build_translation_segments(text: str, *, max_tokens: int = 1024) -> List[LatexSegment]:
-    base_segments = segment_latex_text(text)
-    return split_translatable_segments_by_token_limit(base_segments, max_tokens=max_tokens)
+    """
+    Segment text, reusing the result for a file already planned by this process
+    (e.g. the same paper submitted again). Keyed by a digest, not the text.
+    """
+    key = (hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(), max_tokens)
+    with _segments_cache_lock:
+        cached = _segments_cache.get(key)
+        if cached is not None:
+            _segments_cache.move_to_end(key)
+    if cached is None:
+        base_segments = segment_latex_text(text)
+        cached = tuple(split_translatable_segments_by_token_limit(base_segments, max_tokens=max_tokens))
+        with _segments_cache_lock:
+            _segments_cache[key] = cached
+            while len(_segments_cache) > _SEGMENTS_CACHE_SIZE:
+                _segments_cache.popitem(last=False)
+    # Fresh objects per call: LatexSegment is mutable and callers own their list.
+    return [LatexSegment(seg.text, seg.translatable, seg.start_line, seg.end_line) for seg in cached]
 
 
 def normalize_llm_translated_chunk(text: str) -> str:
@@ -469,12 +596,9 @@ def _restore_edge_whitespace(original: str, translated: str) -> str:
     """
     if not original:
         return translated
-    lead_len = len(original) - len(original.lstrip())
-    trail_len = len(original) - len(original.rstrip())
-    lead = original[:lead_len] if lead_len > 0 else ""
-    trail = original[len(original) - trail_len :] if trail_len > 0 else ""
-    core = translated.strip()
-    return f"{lead}{core}{trail}"
+    lead = original[: len(original) - len(original.lstrip())]
+    trail = original[len(original.rstrip()) :]
+    return f"{lead}{translated.strip()}{trail}"
 
 
 def _mod_in_bracket(match: re.Match[str]) -> str:
@@ -485,13 +609,7 @@ def _mod_in_bracket(match: re.Match[str]) -> str:
 
 
 def _brace_level(s: str) -> int:
-    level = 0
-    for ch in s:
-        if ch == "{":
-            level += 1
-        elif ch == "}":
-            level -= 1
-    return level
+    return s.count("{") - s.count("}")
 
 
 def _join_most(translated: str, original: str) -> str:
@@ -518,6 +636,48 @@ def _join_most(translated: str, original: str) -> str:
     return translated[:p_t] + original[p_o:]
 
 
+_BANNED_SIGNALS = (
+    "Traceback",
+    "[Local Message]",
+    "抱歉，我无法",
+    "公式无需翻译",
+    "请提供您需要翻译的 LaTeX 片段",
+    "请提供需要翻译的 LaTeX 片段",
+    "Please provide the LaTeX",
+    "I cannot comply",
+    "I can’t comply",
+    "I can't comply",
+)
+
+
+def _group_banned_signals(signals: tuple) -> tuple:
+    """Bucket signals under a shared key so a clean chunk pays one scan per bucket."""
+    keys = ("请提供", "comply")
+    groups: Dict[str, List[str]] = {}
+    for sig in signals:
+        key = next((k for k in keys if k in sig), sig)
+        groups.setdefault(key, []).append(sig)
+    return tuple((key, tuple(sigs)) for key, sigs in groups.items())
+
+
+_BANNED_SIGNAL_GROUPS = _group_banned_signals(_BANNED_SIGNALS)
+
+
+def _has_banned_signal(text: str) -> bool:
+    for key, signals in _BANNED_SIGNAL_GROUPS:
+        if key in text and any(sig in text for sig in signals):
+            return True
+    return False
+
+
+_STRUCTURE_CMDS = ("\\begin", "\\end", "\\item", "\\caption")
+_UNESCAPED_PERCENT_RE = re.compile(r"(?<!\\)%")
+_CMD_SPACE_BRACE_RE = re.compile(r"\\([a-zA-Z]{2,20})\ \{")
+_BACKSLASH_SPACE_CMD_RE = re.compile(r"\\\ ([a-zA-Z]{2,20})\{")
+_CMD_BRACKET_RE = re.compile(r"\\([a-zA-Z]{2,20})\{([^\}]*?)\}")
+_UNESCAPED_UNDERSCORE_RE = re.compile(r"(?<!\\)_")
+
+
 def guard_translated_segment(original: str, translated: str) -> str:
     """
     Port of GPT-Academic's fix_content safeguards.
@@ -527,39 +687,23 @@ def guard_translated_segment(original: str, translated: str) -> str:
         return original
 
     # Typical model refusals / tool errors: hard fallback.
-    banned_signals = [
-        "Traceback",
-        "[Local Message]",
-        "抱歉，我无法",
-        "公式无需翻译",
-        "请提供您需要翻译的 LaTeX 片段",
-        "请提供需要翻译的 LaTeX 片段",
-        "Please provide the LaTeX",
-        "I cannot comply",
-        "I can’t comply",
-        "I can't comply",
-    ]
-    if any(sig in out for sig in banned_signals):
+    if _has_banned_signal(out):
         return original
 
-    out = re.sub(r"(?<!\\)%", r"\\%", out)
-    out = re.sub(r"\\([a-zA-Z]{2,20})\ \{", r"\\\1{", out)
-    out = re.sub(r"\\\ ([a-zA-Z]{2,20})\{", r"\\\1{", out)
-    out = re.sub(r"\\([a-zA-Z]{2,20})\{([^\}]*?)\}", _mod_in_bracket, out)
+    out = _UNESCAPED_PERCENT_RE.sub(r"\\%", out)
+    out = _CMD_SPACE_BRACE_RE.sub(r"\\\1{", out)
+    out = _BACKSLASH_SPACE_CMD_RE.sub(r"\\\1{", out)
+    out = _CMD_BRACKET_RE.sub(_mod_in_bracket, out)
 
-    # Keep command structure stable.
-    if original.count("\\begin") != out.count("\\begin"):
-        return original
-    if original.count("\\end") != out.count("\\end"):
-        return original
-    if original.count("\\item") != out.count("\\item"):
-        return original
-    if original.count("\\caption") != out.count("\\caption"):
-        return original
+    # Keep command structure stable (plain prose has no commands to compare).
+    if "\\" in original or "\\" in out:
+        for cmd in _STRUCTURE_CMDS:
+            if original.count(cmd) != out.count(cmd):
+                return original
 
     # Escape underscore regression.
     if original.count(r"\_") > 0 and original.count(r"\_") > out.count(r"\_"):
-        out = re.sub(r"(?<!\\)_", r"\\_", out)
+        out = _UNESCAPED_UNDERSCORE_RE.sub(r"\\_", out)
 
     # Braces mismatch: align as much as possible, else fallback.
     if _brace_level(out) != _brace_level(original):
@@ -577,16 +721,10 @@ def guard_translated_segment(original: str, translated: str) -> str:
 def _find_matching_brace(text: str, open_pos: int) -> int:
     if open_pos < 0 or open_pos >= len(text) or text[open_pos] != "{":
         return -1
-    level = 0
-    for i in range(open_pos, len(text)):
-        ch = text[i]
-        if ch == "{":
-            level += 1
-        elif ch == "}":
-            level -= 1
-            if level == 0:
-                return i
-    return -1
+    return _find_closing_brace(text, open_pos + 1)
+
+
+_SECTION_CMD_RE = re.compile(r"\\section\*?(?:\s*\[[^\]]*\])?\s*\{", re.DOTALL)
 
 
 def ensure_section_title_bold(text: str) -> str:
@@ -597,11 +735,10 @@ def ensure_section_title_bold(text: str) -> str:
     if not text:
         return text
 
-    cmd_re = re.compile(r"\\section\*?(?:\s*\[[^\]]*\])?\s*\{", re.DOTALL)
     out_parts: List[str] = []
     cursor = 0
 
-    for m in cmd_re.finditer(text):
+    for m in _SECTION_CMD_RE.finditer(text):
         open_pos = m.end() - 1  # points to "{"
         close_pos = _find_matching_brace(text, open_pos)
         if close_pos < 0:
@@ -3,38 +3,66 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict
 import json
+import os
+import uuid
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
 
 @dataclass(frozen=True)
 class JobPaths:
+    """Job directory layout; derived paths are built on first access."""
+
     base_dir: Path
-    job_root: Path
-    source_dir: Path
-    source_archive: Path
-    extract_dir: Path
-    work_dir: Path
-    translated_dir: Path
-    output_dir: Path
-    job_json: Path
+    arxiv_id: str
+    job_id: str
+
+    @cached_property
+    def resolved_base_dir(self) -> Path:
+        return self.base_dir.resolve()
+
+    @cached_property
+    def job_root(self) -> Path:
+        return self.base_dir / self.arxiv_id / self.job_id
+
+    @cached_property
+    def source_dir(self) -> Path:
+        return self.job_root / "source"
+
+    @cached_property
+    def source_archive(self) -> Path:
+        return self.source_dir / "source.tar"
+
+    @cached_property
+    def extract_dir(self) -> Path:
+        return self.source_dir / "extract"
+
+    @cached_property
+    def work_dir(self) -> Path:
+        return self.job_root / "work"
+
+    @cached_property
+    def translated_dir(self) -> Path:
+        return self.work_dir / "translated"
+
+    @cached_property
+    def output_dir(self) -> Path:
+        return self.job_root / "output"
+
+    @cached_property
+    def job_json(self) -> Path:
+        return self.job_root / "job.json"
 
 
 def build_job_paths(base_dir: str | Path, arxiv_id: str, job_id: str) -> JobPaths:
-    root = Path(base_dir)
-    job_root = root / arxiv_id / job_id
-    return JobPaths(
-        base_dir=root,
-        job_root=job_root,
-        source_dir=job_root / "source",
-        source_archive=job_root / "source" / "source.tar",
-        extract_dir=job_root / "source" / "extract",
-        work_dir=job_root / "work",
-        translated_dir=job_root / "work" / "translated",
-        output_dir=job_root / "output",
-        job_json=job_root / "job.json",
-    )
+    return JobPaths(base_dir=Path(base_dir), arxiv_id=arxiv_id, job_id=job_id)
 
 
 def ensure_job_dirs(paths: JobPaths) -> None:
@@ -49,19 +77,51 @@ def ensure_job_dirs(paths: JobPaths) -> None:
         p.mkdir(parents=True, exist_ok=True)
 
 
+def _dump_json_bytes(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload)
+        except TypeError:
+            pass
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def save_job_json(paths: JobPaths, payload: Dict[str, Any]) -> None:
-    paths.job_json.parent.mkdir(parents=True, exist_ok=True)
-    paths.job_json.write_text(
-        json.dumps(payload, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    """Write job.json atomically: readers see either the old or the new file."""
+    target = paths.job_json
+    target.parent.mkdir(parents=True, exist_ok=True)
+    data = _dump_json_bytes(payload)
+    tmp = target.parent / f".job.{uuid.uuid4().hex}.json.tmp"
+    # Mode 0o666 like open(): the kernel applies the umask (mkstemp would give 0600).
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_json_file(path: Path) -> Any:
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
 
 
 def artifact_payload(*, file_path: Path, paths: JobPaths, static_prefix: str) -> Dict[str, Any]:
-    rel = file_path.resolve().relative_to(paths.base_dir.resolve())
+    rel = file_path.resolve().relative_to(paths.resolved_base_dir)
+    try:
+        size_bytes = file_path.stat().st_size
+    except OSError:
+        size_bytes = 0
     return {
         "name": file_path.name,
         "path": str(file_path),
         "url": f"{static_prefix}/{rel.as_posix()}",
-        "size_bytes": file_path.stat().st_size if file_path.exists() else 0,
+        "size_bytes": size_bytes,
     }
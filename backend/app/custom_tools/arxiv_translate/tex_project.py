@@ -8,7 +8,8 @@ Review note:
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+import os
 
 
 def normalize_project_root(extract_dir: Path) -> Path:
@@ -20,35 +21,56 @@ def normalize_project_root(extract_dir: Path) -> Path:
     children = [p for p in extract_dir.iterdir() if p.name != "__MACOSX"]
     if len(children) == 1 and children[0].is_dir():
         inner = children[0]
-        if list(inner.rglob("*.tex")):
+        if next(inner.rglob("*.tex"), None) is not None:
             return inner
     return extract_dir
 
 
-def discover_tex_files(project_root: Path) -> List[Path]:
-    files: List[Path] = []
-    for p in project_root.rglob("*.tex"):
-        rel = p.relative_to(project_root)
-        if any(part.startswith(".") for part in rel.parts):
+def _iter_tex_rel_paths(project_root: Path) -> Iterator[str]:
+    """
+    Relative paths of .tex files under project_root. Hidden entries are pruned
+    while walking, and symlinked directories are not followed (like rglob).
+    """
+    stack = [(str(project_root), "")]
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError:
             continue
-        files.append(rel)
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((entry.path, rel_prefix + name + "/"))
+                elif name.endswith(".tex"):
+                    yield rel_prefix + name
+
+
+def discover_tex_files(project_root: Path) -> List[Path]:
+    files = [Path(rel) for rel in _iter_tex_rel_paths(project_root)]
     files.sort(key=lambda p: str(p))
     return files
 
 
-def _score_main_tex(content: str, rel_path: Path) -> int:
+_NEGATIVE_MAIN_KEYWORDS = (b"template", b"guidelines", b"instruction for authors", b"blind review")
+
+
+def _score_main_tex(content: bytes, rel_path: Path) -> int:
     score = 0
-    if "\\documentclass" in content:
+    if b"\\documentclass" in content:
         score += 10
-    if "\\begin{document}" in content:
+    if b"\\begin{document}" in content:
         score += 6
-    if "\\title{" in content:
+    if b"\\title{" in content:
         score += 3
-    if "\\input{" in content or "\\include{" in content:
+    if b"\\input{" in content or b"\\include{" in content:
         score += 2
 
     lowered = content.lower()
-    for keyword in ["template", "guidelines", "instruction for authors", "blind review"]:
+    for keyword in _NEGATIVE_MAIN_KEYWORDS:
         if keyword in lowered:
             score -= 3
     if rel_path.name.lower().startswith("merge"):
@@ -65,9 +87,9 @@ def find_main_tex_file(project_root: Path, tex_files: List[Path]) -> Path:
 
     candidates: List[tuple[int, Path]] = []
     for rel in tex_files:
-        full = project_root / rel
-        content = full.read_text(encoding="utf-8", errors="ignore")
-        if "\\documentclass" not in content:
+        # Markers and keywords are ASCII: score the raw bytes, no decode needed.
+        content = (project_root / rel).read_bytes()
+        if b"\\documentclass" not in content:
             continue
         candidates.append((_score_main_tex(content, rel), rel))
 
@@ -0,0 +1,96 @@
+"""Persistent exact-match cache of translated chunks.
+
+Review note:
+- 以 (模型, 目标语言, 附加要求, 原文分片) 的哈希为键，重复翻译同一论文时直接复用译文。
+- 缓存读写失败只会退回正常翻译，不影响任务本身。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Tuple
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+_SQLITE_MAX_PARAMS = 500
+
+
+def translation_cache_key(model: str, target_language: str, extra_instruction: str, chunk: str) -> str:
+    raw = f"{model}|{target_language}|{extra_instruction}|{chunk}".encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+class TranslationCache:
+    """SQLite-backed key/value store; blocking, call it from a worker thread."""
+
+    def __init__(self, db_path: Path, *, ttl_sec: int) -> None:
+        self.db_path = Path(db_path)
+        self.ttl_sec = int(ttl_sec)
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        with self._ready_lock:
+            if self._ready:
+                return
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS translation_cache "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at INTEGER NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_translation_cache_created_at "
+                    "ON translation_cache (created_at)"
+                )
+                if self.ttl_sec > 0:
+                    # Expire old rows once per process, on first use.
+                    conn.execute(
+                        "DELETE FROM translation_cache WHERE created_at < ?",
+                        (int(time.time()) - self.ttl_sec,),
+                    )
+            self._ready = True
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        self._ensure_ready()
+        unique = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        conn = self._connect()
+        try:
+            for start in range(0, len(unique), _SQLITE_MAX_PARAMS):
+                batch = unique[start : start + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT key, value FROM translation_cache WHERE key IN ({placeholders})",
+                    batch,
+                )
+                found.update(rows)
+        finally:
+            conn.close()
+        return found
+
+    def put_many(self, items: List[Tuple[str, str]]) -> None:
+        if not items:
+            return
+        self._ensure_ready()
+        now = int(time.time())
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO translation_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    [(key, value, now) for key, value in items],
+                )
+        finally:
+            conn.close()
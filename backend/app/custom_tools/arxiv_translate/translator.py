@@ -8,13 +8,19 @@ Review note:
 from __future__ import annotations
 
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from typing import Awaitable, Callable, List, Optional
 import asyncio
+import random
+import re
+import time
 
+import httpx
 from httpx import Timeout
-from openai import AsyncOpenAI
+from openai import APIStatusError, AsyncOpenAI, RateLimitError
 
 from app.custom_tools.arxiv_translate.splitter import normalize_llm_translated_chunk
+from app.custom_tools.arxiv_translate.translation_cache import TranslationCache, translation_cache_key
 
 
 ProgressFn = Optional[Callable[[int, int], Awaitable[None]]]
@@ -28,39 +34,137 @@ class TranslatorConfig:
     target_language: str = "中文"
     concurrency: int = 2
     timeout_sec: int = 120
+    # Account limits; 0 disables the corresponding bucket.
+    max_requests_per_minute: int = 0
+    max_tokens_per_minute: int = 0
 
 
-def _build_messages(chunk: str, target_language: str, extra_instruction: str) -> List[dict]:
+_RATE_LIMIT_COOLDOWN_SEC = 15.0
+_COMPLETION_TOKEN_ALLOWANCE = 512
+_MAX_RETRY_DELAY_SEC = 60.0
+# openai wraps these in APIConnectionError and keeps them as __cause__.
+_RESET_ERRORS = (httpx.RemoteProtocolError, httpx.ReadError)
+_RESET_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_RESET_UNIT_SEC = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class _RateLimiter:
+    """
+    Request and token buckets refilled continuously at the per-minute limits.
+    A 429 halves what is left and the refill rate for a short cool-down.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.rpm = max(0, int(requests_per_minute))
+        self.tpm = max(0, int(tokens_per_minute))
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._last = time.monotonic()
+        self._cooldown_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.rpm or self.tpm)
+
+    def _refill(self, now: float) -> float:
+        scale = 0.5 if now < self._cooldown_until else 1.0
+        elapsed = now - self._last
+        self._last = now
+        if self.rpm:
+            self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.0 * scale)
+        if self.tpm:
+            self._tokens = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.0 * scale)
+        return scale
+
+    async def acquire(self, tokens: int) -> None:
+        if not self.enabled:
+            return
+        # A request larger than the whole bucket would otherwise never start.
+        tokens = min(tokens, self.tpm) if self.tpm else 0
+        async with self._lock:
+            while True:
+                scale = self._refill(time.monotonic())
+                wait = 0.0
+                if self.rpm and self._requests < 1:
+                    wait = max(wait, (1 - self._requests) * 60.0 / (self.rpm * scale))
+                if self.tpm and self._tokens < tokens:
+                    wait = max(wait, (tokens - self._tokens) * 60.0 / (self.tpm * scale))
+                if wait <= 0:
+                    if self.rpm:
+                        self._requests -= 1
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep(max(wait, 0.05))
+
+    def penalize(self) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self._requests *= 0.5
+        self._tokens *= 0.5
+        self._cooldown_until = now + _RATE_LIMIT_COOLDOWN_SEC
+
+
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional translator.",
+}
+
+
+def _header_delay(headers: httpx.Headers) -> Optional[float]:
+    """Cool-down advertised by a 429 response: Retry-After or x-ratelimit-reset-*."""
+    retry_after = (headers.get("retry-after") or "").strip()
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    delays = []
+    for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens"):
+        # e.g. "1s", "6m0s", "20ms"
+        parts = _RESET_DURATION_RE.findall(headers.get(name) or "")
+        if parts:
+            delays.append(sum(float(value) * _RESET_UNIT_SEC[unit] for value, unit in parts))
+    return max(delays) if delays else None
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying after `exc`; None means do not retry."""
+    if isinstance(exc, RateLimitError):
+        delay = _header_delay(exc.response.headers)
+        if delay is not None:
+            return min(delay, _MAX_RETRY_DELAY_SEC)
+    elif isinstance(exc, APIStatusError) and 400 <= exc.status_code < 500 and exc.status_code not in (408, 409):
+        # Auth, bad request, unknown model...: retrying cannot help.
+        return None
+    elif isinstance(exc, _RESET_ERRORS) or isinstance(exc.__cause__, _RESET_ERRORS):
+        # Server dropped a kept-alive connection: reconnect right away.
+        # Timeouts and connect failures fall through to the backoff below.
+        return 0.0
+    return min(2 ** attempt + random.random(), 30.0)
+
+
+def _build_prompt_prefix(target_language: str, extra_instruction: str) -> str:
+    """User prompt up to the chunk text; identical for every chunk of a job."""
     more_requirement = (extra_instruction or "").strip()
     if more_requirement and not more_requirement.endswith(" "):
         more_requirement += " "
     target = (target_language or "").strip()
     if ("中文" in target) or (target.lower() in {"zh", "chinese"}):
-        user_prompt = (
-            "Below is a section from an English academic paper, translate it into Chinese. "
-            + more_requirement
-            + r"Do not modify any latex command such as \section, \cite, \begin, \item and equations. "
-            + r"Answer me only with the translated text:"
-            + f"\n\n{chunk}"
-        )
+        head = "Below is a section from an English academic paper, translate it into Chinese. "
     else:
-        user_prompt = (
-            f"Below is a section from an English academic paper, translate it into {target or 'the target language'}. "
-            + more_requirement
-            + r"Do not modify any latex command such as \section, \cite, \begin, \item and equations. "
-            + r"Answer me only with the translated text:"
-            + f"\n\n{chunk}"
-        )
-    return [
-        {
-            "role": "system",
-            "content": "You are a professional translator.",
-        },
-        {
-            "role": "user",
-            "content": user_prompt,
-        },
-    ]
+        head = f"Below is a section from an English academic paper, translate it into {target or 'the target language'}. "
+    return (
+        head
+        + more_requirement
+        + r"Do not modify any latex command such as \section, \cite, \begin, \item and equations. "
+        + r"Answer me only with the translated text:"
+        + "\n\n"
+    )
 
 
 async def _translate_one_chunk(
@@ -68,26 +172,44 @@ async def _translate_one_chunk(
     *,
     chunk: str,
     cfg: TranslatorConfig,
-    extra_instruction: str,
+    prompt_prefix: str,
+    limiter: Optional[_RateLimiter] = None,
     retries: int = 3,
 ) -> str:
     last_err: Optional[Exception] = None
+    token_cost = len(chunk) // 4 + _COMPLETION_TOKEN_ALLOWANCE
+    messages = [_SYSTEM_MESSAGE, {"role": "user", "content": prompt_prefix + chunk}]
     for attempt in range(1, retries + 1):
         try:
-            resp = await client.chat.completions.create(
+            if limiter is not None:
+                await limiter.acquire(token_cost)
+            stream = await client.chat.completions.create(
                 model=cfg.model,
-                messages=_build_messages(chunk, cfg.target_language, extra_instruction),
+                messages=messages,
                 temperature=0.0,
+                stream=True,
             )
-            content = (resp.choices[0].message.content or "").strip()
+            # Fresh buffer per attempt so a retry never mixes partial outputs.
+            parts: List[str] = []
+            async for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+            content = "".join(parts).strip()
             if not content:
                 raise RuntimeError("模型返回空文本。")
             return normalize_llm_translated_chunk(content)
         except Exception as exc:
             last_err = exc
-            if attempt >= retries:
+            if limiter is not None and isinstance(exc, RateLimitError):
+                limiter.penalize()
+            delay = _retry_delay(exc, attempt)
+            if delay is None or attempt >= retries:
                 break
-            await asyncio.sleep(min(1.5 * attempt, 4))
+            if delay > 0:
+                await asyncio.sleep(delay)
     raise RuntimeError(f"翻译分片失败：{last_err}")
 
 
@@ -97,6 +219,7 @@ async def translate_chunks(
     *,
     extra_instruction: str = "",
     on_progress: ProgressFn = None,
+    cache: Optional[TranslationCache] = None,
 ) -> List[str]:
     if not cfg.api_key:
         raise RuntimeError("缺少 API Key，无法执行论文翻译。")
@@ -105,34 +228,98 @@ async def translate_chunks(
     if not chunks:
         return []
 
+    translated = [""] * len(chunks)
+    done = 0
+    total = len(chunks)
+    done_lock = asyncio.Lock()
+
+    keys: List[str] = []
+    pending = list(range(total))
+    if cache is not None:
+        keys = [
+            translation_cache_key(cfg.model, cfg.target_language, extra_instruction, chunk)
+            for chunk in chunks
+        ]
+        try:
+            hits = await asyncio.to_thread(cache.get_many, keys)
+        except Exception:
+            hits = {}
+        if hits:
+            pending = []
+            for index, key in enumerate(keys):
+                cached = hits.get(key)
+                if cached is None:
+                    pending.append(index)
+                else:
+                    translated[index] = cached
+            done = total - len(pending)
+            if on_progress:
+                await on_progress(done, total)
+
+    if not pending:
+        return translated
+
+    concurrency = max(1, int(cfg.concurrency))
+    timeout = Timeout(float(cfg.timeout_sec))
+    # Pool sized to this job's concurrency; idle connections are reused across chunks.
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=concurrency * 4,
+            max_keepalive_connections=concurrency,
+            keepalive_expiry=120,
+        ),
+    )
     client_kwargs = {
         "api_key": cfg.api_key,
-        "timeout": Timeout(float(cfg.timeout_sec)),
+        "timeout": timeout,
+        "http_client": http_client,
     }
     if cfg.base_url:
         client_kwargs["base_url"] = cfg.base_url
     client = AsyncOpenAI(**client_kwargs)
 
-    semaphore = asyncio.Semaphore(max(1, int(cfg.concurrency)))
-    translated = [""] * len(chunks)
-    done = 0
-    total = len(chunks)
-    done_lock = asyncio.Lock()
+    prompt_prefix = _build_prompt_prefix(cfg.target_language, extra_instruction)
+    limiter = _RateLimiter(cfg.max_requests_per_minute, cfg.max_tokens_per_minute)
+    # Fixed pool of `concurrency` workers draining a queue of chunk indexes.
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for index in pending:
+        queue.put_nowait(index)
 
-    async def worker(index: int, chunk: str) -> None:
+    async def worker() -> None:
         nonlocal done
-        async with semaphore:
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
             result = await _translate_one_chunk(
                 client,
-                chunk=chunk,
+                chunk=chunks[index],
                 cfg=cfg,
-                extra_instruction=extra_instruction,
+                prompt_prefix=prompt_prefix,
+                limiter=limiter if limiter.enabled else None,
             )
             translated[index] = result
-        async with done_lock:
-            done += 1
-            if on_progress:
-                await on_progress(done, total)
+            if cache is not None:
+                try:
+                    await asyncio.to_thread(cache.put_many, [(keys[index], result)])
+                except Exception:
+                    pass
+            async with done_lock:
+                done += 1
+                if on_progress:
+                    await on_progress(done, total)
 
-    await asyncio.gather(*(worker(i, c) for i, c in enumerate(chunks)))
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(pending)))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        # A failed chunk fails the job; stop the other workers instead of
+        # letting them keep spending API calls.
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await client.close()
     return translated
@@ -1,15 +1,26 @@
 """Bib 数据加载与查询"""
 from __future__ import annotations
 
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+import copy
 import json
 import re
-from typing import Dict, List
+import threading
+from typing import Dict, List, Optional, Tuple
 
 import bibtexparser
 from bibtexparser.bwriter import BibTexWriter
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 BACKEND_DIR = Path(__file__).resolve().parents[3]
 BIB_DATA_DIR = BACKEND_DIR / "data" / "custom_tools" / "bib_lookup"
@@ -22,13 +33,18 @@ class VenueRule:
     abbr: str
     full_name: str
     type: str
-    regex: List[str]
+    regex: List[re.Pattern[str]]
+
+
+_NON_ALPHA_RE = re.compile(r"[^a-zA-Z]")
+# title = {xxx} / title = "xxx"; greedy so nested braces stay inside the title.
+_TITLE_FIELD_RE = re.compile(r'title\s*=\s*[{"](.+)[}"]', re.IGNORECASE)
 
 
+@lru_cache(maxsize=8192)
 def normalize_title(title_str: str) -> str:
-    """与 rebiber 一致的标题归一化逻辑"""
-    title_str = re.sub(r"[^a-zA-Z]", r"", title_str)
-    return title_str.lower().replace(" ", "").strip()
+    """与 rebiber 一致的标题归一化逻辑（只保留字母并转小写）"""
+    return _NON_ALPHA_RE.sub("", title_str).lower()
 
 
 def _load_bib_list() -> List[Path]:
@@ -36,6 +52,14 @@ def _load_bib_list() -> List[Path]:
     return sorted((BIB_DATA_DIR / "data").glob("*.json"))
 
 
+def _read_bib_file(file_path: Path) -> Dict[str, List[str]]:
+    """data: {normalized_title: [bib lines...]}"""
+    raw = file_path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
 def _load_venue_rules() -> List[VenueRule]:
     if not VENUE_RULES_PATH.exists():
         return []
@@ -55,7 +79,15 @@ def _load_venue_rules() -> List[VenueRule]:
         raw_regex = item.get("regex", [])
         if not abbr or not isinstance(raw_regex, list):
             continue
-        regexes = [str(pattern).strip() for pattern in raw_regex if str(pattern).strip()]
+        regexes: List[re.Pattern[str]] = []
+        for pattern in raw_regex:
+            pattern = str(pattern).strip()
+            if not pattern:
+                continue
+            try:
+                regexes.append(re.compile(pattern, re.DOTALL))
+            except re.error:
+                continue
         if not regexes:
             continue
         rules.append(
@@ -79,13 +111,7 @@ def _rule_applies_to_place(rule: VenueRule, place: str) -> bool:
 
 
 def _rule_matches_text(rule: VenueRule, text: str) -> bool:
-    for pattern in rule.regex:
-        try:
-            if re.search(pattern, text, flags=re.DOTALL):
-                return True
-        except re.error:
-            continue
-    return False
+    return any(pattern.search(text) for pattern in rule.regex)
 
 
 def _normalize_venue_by_rules(value: str, place: str, rules: List[VenueRule], shorten: bool) -> str:
@@ -100,29 +126,90 @@ def _normalize_venue_by_rules(value: str, place: str, rules: List[VenueRule], sh
     return value
 
 
+_VENUE_CACHE_SIZE = 4096
+_PARSED_ENTRY_CACHE_SIZE = 2048
+_TITLE_GRAM = 4
+
+
+def _build_title_gram_index(titles: List[str]) -> Dict[str, array]:
+    """4-gram -> positions (in titles) of every normalized title containing it."""
+    index: Dict[str, array] = {}
+    for pos, title in enumerate(titles):
+        for gram in {title[i : i + _TITLE_GRAM] for i in range(len(title) - _TITLE_GRAM + 1)}:
+            postings = index.get(gram)
+            if postings is None:
+                postings = index[gram] = array("I")
+            postings.append(pos)
+    return index
+
+
 class BibStore:
     def __init__(self) -> None:
         self._bib_db: Dict[str, List[str]] = {}
+        self._titles: List[str] = []
+        self._title_pos: Dict[str, int] = {}
+        self._title_grams: Optional[Dict[str, array]] = None
         self._venue_rules: List[VenueRule] = []
+        # Bibliographies repeat the same venue strings; remember their normalized form.
+        self._venue_cache: Dict[Tuple[str, str, bool], str] = {}
+        # Parsed form of each bib entry string; bibtexparser is slow to re-run.
+        self._parsed_cache: "OrderedDict[str, object]" = OrderedDict()
         self._loaded = False
+        self._load_lock = threading.Lock()
 
     def load(self) -> None:
         if self._loaded:
             return
+        with self._load_lock:
+            if not self._loaded:
+                self._load_locked()
 
-        bib_files = _load_bib_list()
+    def _load_locked(self) -> None:
+        bib_files = [p for p in _load_bib_list() if p.exists()]
         bib_db: Dict[str, List[str]] = {}
-        for file_path in bib_files:
-            if not file_path.exists():
-                continue
-            with file_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            # data: {normalized_title: [bib lines...]}
-            bib_db.update(data)
+        if bib_files:
+            # Overlap file reads; map() keeps file order so later files still win.
+            with ThreadPoolExecutor(max_workers=min(8, len(bib_files))) as pool:
+                for data in pool.map(_read_bib_file, bib_files):
+                    bib_db.update(data)
         self._bib_db = bib_db
+        self._titles = list(bib_db)
+        self._title_pos = {title: pos for pos, title in enumerate(self._titles)}
+        self._title_grams = None
         self._venue_rules = _load_venue_rules()
+        self._venue_cache = {}
         self._loaded = True
 
+    def _normalize_venue(self, value: str, place: str, shorten: bool) -> str:
+        key = (value, place, shorten)
+        cached = self._venue_cache.get(key)
+        if cached is None:
+            cached = _normalize_venue_by_rules(
+                value=value,
+                place=place,
+                rules=self._venue_rules,
+                shorten=shorten,
+            )
+            if len(self._venue_cache) >= _VENUE_CACHE_SIZE:
+                self._venue_cache.clear()
+            self._venue_cache[key] = cached
+        return cached
+
+    def _ensure_title_grams(self) -> Dict[str, array]:
+        # Built on first fuzzy search (or by warm_up); exact lookups never need it.
+        grams = self._title_grams
+        if grams is None:
+            with self._load_lock:
+                if self._title_grams is None:
+                    self._title_grams = _build_title_gram_index(self._titles)
+                grams = self._title_grams
+        return grams
+
+    def warm_up(self) -> None:
+        """Load data and build the search index ahead of the first request."""
+        self.load()
+        self._ensure_title_grams()
+
     def lookup(self, title: str) -> List[str] | None:
         self.load()
         key = normalize_title(title)
@@ -133,13 +220,34 @@ class BibStore:
         key = normalize_title(title)
         if not key:
             return []
-        candidates: List[List[str]] = []
-        for k, v in self._bib_db.items():
-            if key in k or k in key:
-                candidates.append(v)
-                if len(candidates) >= limit:
-                    break
-        return candidates
+        if len(key) < _TITLE_GRAM:
+            candidates: List[List[str]] = []
+            for k, v in self._bib_db.items():
+                if key in k or k in key:
+                    candidates.append(v)
+                    if len(candidates) >= limit:
+                        break
+            return candidates
+
+        # Titles containing the query hold all of its 4-grams: verify the
+        # rarest gram's postings. Titles contained in the query are substrings
+        # of it, so look those up directly.
+        matched = set()
+        grams = {key[i : i + _TITLE_GRAM] for i in range(len(key) - _TITLE_GRAM + 1)}
+        postings = [self._ensure_title_grams().get(gram) for gram in grams]
+        if all(postings):
+            titles = self._titles
+            matched.update(pos for pos in min(postings, key=len) if key in titles[pos])
+        title_pos = self._title_pos
+        if "" in title_pos:
+            matched.add(title_pos[""])
+        for i in range(len(key)):
+            for j in range(i + 1, len(key) + 1):
+                pos = title_pos.get(key[i:j])
+                if pos is not None:
+                    matched.add(pos)
+        # Same order as scanning the merged dict.
+        return [self._bib_db[self._titles[pos]] for pos in sorted(matched)[:limit]]
 
     def post_process(
         self,
@@ -148,12 +256,22 @@ class BibStore:
         remove_fields: List[str],
     ) -> str:
         bib_entry_str = "".join(entry_lines)
-        bibparser = bibtexparser.bparser.BibTexParser(ignore_nonstandard_types=False)
-        parsed = bibtexparser.loads(bib_entry_str, bibparser)
-        if not parsed.entries:
+        cached = self._parsed_cache.get(bib_entry_str)
+        if cached is None:
+            bibparser = bibtexparser.bparser.BibTexParser(ignore_nonstandard_types=False)
+            cached = bibtexparser.loads(bib_entry_str, bibparser)
+            self._parsed_cache[bib_entry_str] = cached
+            if len(self._parsed_cache) > _PARSED_ENTRY_CACHE_SIZE:
+                self._parsed_cache.popitem(last=False)
+        else:
+            self._parsed_cache.move_to_end(bib_entry_str)
+        if not cached.entries:
             return bib_entry_str
 
-        entry = parsed.entries[0]
+        # Edit a copy of the first entry; the cached database stays pristine.
+        parsed = copy.copy(cached)
+        entry = dict(cached.entries[0])
+        parsed.entries = [entry] + cached.entries[1:]
         for field in remove_fields:
             if field in entry:
                 del entry[field]
@@ -162,12 +280,7 @@ class BibStore:
             for place in ["booktitle", "journal"]:
                 if place not in entry:
                     continue
-                entry[place] = _normalize_venue_by_rules(
-                    value=entry[place],
-                    place=place,
-                    rules=self._venue_rules,
-                    shorten=shorten,
-                )
+                entry[place] = self._normalize_venue(entry[place], place, shorten)
 
         writer = BibTexWriter()
         writer.order_entries_by = None
@@ -176,8 +289,7 @@ class BibStore:
     def extract_title(self, entry_lines: List[str]) -> str:
         for line in entry_lines:
             if line.lower().strip().startswith("title"):
-                # title = {xxx}
-                m = re.search(r"title\\s*=\\s*[\\{\\\"](.+)[\\}\\\"]", line, flags=re.IGNORECASE)
+                m = _TITLE_FIELD_RE.search(line)
                 if m:
                     return m.group(1).strip()
         return ""
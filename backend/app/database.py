@@ -4,6 +4,7 @@ Review note:
 - 对话库使用 conversations.extra / messages.extra 作为可扩展 JSON 容器。
 - 启动时保留轻量兼容逻辑：旧库缺列时自动补齐。
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import StaticPool
 from typing import AsyncGenerator
@@ -13,6 +14,9 @@ from app.config import settings
 
 logger = logging.getLogger("uvicorn.error")
 
+# 对话库兼容列与索引补齐后写入 PRAGMA user_version 的版本号
+_CHAT_SCHEMA_VERSION = 4
+
 # 创建工具数据库异步引擎（分类、工具、配置）
 tools_engine = create_async_engine(
     settings.DATABASE_URL,
@@ -29,6 +33,30 @@ chat_engine = create_async_engine(
     echo=settings.DEBUG,
 )
 
+# SQLite 连接参数：WAL 让读写互不阻塞，synchronous=NORMAL 在 WAL 下仍保证一致性
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+for _engine in (tools_engine, chat_engine):
+    if _engine.dialect.name == "sqlite":
+        event.listen(_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+
+
 # 创建工具数据库会话工厂
 tools_session_maker = async_sessionmaker(
     tools_engine,
@@ -70,6 +98,13 @@ async def get_chat_session() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+def _create_missing_indexes(sync_conn, tables) -> None:
+    """create_all 不会给已存在的表补索引，这里逐个补齐。"""
+    for table in tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def init_db() -> None:
     """初始化数据库表"""
     from app.models.base import Base
@@ -94,18 +129,34 @@ async def init_db() -> None:
             Conversation.__table__,
             Message.__table__,
         ])
-        # 兼容旧库：补充 conversations/messages 扩展列与历史列
-        result = await conn.exec_driver_sql("PRAGMA table_info(conversations)")
-        conversation_columns = [row[1] for row in result.fetchall()]
-        if "extra" not in conversation_columns:
-            await conn.exec_driver_sql("ALTER TABLE conversations ADD COLUMN extra TEXT")
-
-        result = await conn.exec_driver_sql("PRAGMA table_info(messages)")
-        message_columns = [row[1] for row in result.fetchall()]
-        if "cost_meta" not in message_columns:
-            await conn.exec_driver_sql("ALTER TABLE messages ADD COLUMN cost_meta TEXT")
-        if "thinking" not in message_columns:
-            await conn.exec_driver_sql("ALTER TABLE messages ADD COLUMN thinking TEXT")
-        if "extra" not in message_columns:
-            await conn.exec_driver_sql("ALTER TABLE messages ADD COLUMN extra TEXT")
+        # 兼容旧库：补充 conversations/messages 扩展列与历史列。
+        # 已补齐的库在 user_version 里记了版本号，直接跳过 PRAGMA 检查。
+        result = await conn.exec_driver_sql("PRAGMA user_version")
+        if (result.scalar() or 0) < _CHAT_SCHEMA_VERSION:
+            result = await conn.exec_driver_sql("PRAGMA table_info(conversations)")
+            conversation_columns = {row[1] for row in result.fetchall()}
+            result = await conn.exec_driver_sql("PRAGMA table_info(messages)")
+            message_columns = {row[1] for row in result.fetchall()}
+            statements = [
+                f"ALTER TABLE {table} ADD COLUMN {column} TEXT"
+                for table, columns, column in (
+                    ("conversations", conversation_columns, "extra"),
+                    ("messages", message_columns, "cost_meta"),
+                    ("messages", message_columns, "thinking"),
+                    ("messages", message_columns, "extra"),
+                )
+                if column not in columns
+            ]
+            # 旧库的单列索引已被组合索引取代
+            statements += [
+                "DROP INDEX IF EXISTS ix_conversations_updated_at",
+                "DROP INDEX IF EXISTS ix_conversations_tool_id",
+                "DROP INDEX IF EXISTS ix_messages_conversation_id",
+                "DROP INDEX IF EXISTS ix_messages_created_at",
+            ]
+            # 与建表处于同一事务，一起提交
+            for statement in statements:
+                await conn.exec_driver_sql(statement)
+            await conn.run_sync(_create_missing_indexes, [Conversation.__table__, Message.__table__])
+            await conn.exec_driver_sql(f"PRAGMA user_version = {_CHAT_SCHEMA_VERSION}")
         logger.info("对话历史数据库表创建成功")
@@ -7,15 +7,39 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
 from app.config import settings
+from app.custom_tools.bib_lookup import bib_store
 from app.database import init_db
 
 logger = logging.getLogger("uvicorn.error")
 
 
+def _log_bib_warm_up_result(task: asyncio.Task) -> None:
+    """预加载失败时记录日志，避免异常无人读取。"""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Bib 数据预加载失败: %s", exc, exc_info=exc)
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles 自带 ETag / Last-Modified 与 304，这里补上 Cache-Control。"""
+
+    def __init__(self, *args, cache_control: str, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = self.cache_control
+        return response
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
@@ -34,6 +58,10 @@ async def lifespan(app: FastAPI):
     await init_db()
     
     logger.info("数据库初始化完成")
+
+    # 后台预加载 Bib 数据与检索索引，避免首个请求阻塞事件循环
+    app.state.bib_warm_up = asyncio.create_task(asyncio.to_thread(bib_store.warm_up))
+    app.state.bib_warm_up.add_done_callback(_log_bib_warm_up_result)
     logger.info("服务器运行在: http://0.0.0.0:8000")
     logger.info("API文档: http://0.0.0.0:8000/docs")
     
@@ -41,6 +69,8 @@ async def lifespan(app: FastAPI):
     
     # 关闭时执行
     logger.info("关闭AI工具平台后端...")
+    app.state.bib_warm_up.cancel()
+    await asyncio.gather(app.state.bib_warm_up, return_exceptions=True)
 
 
 # 创建FastAPI应用
@@ -64,9 +94,19 @@ app.add_middleware(
 if os.path.exists("uploads"):
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 if os.path.exists(settings.PAPER_DATA_DIR):
-    app.mount("/papers", StaticFiles(directory=settings.PAPER_DATA_DIR), name="papers")
+    # 论文 PDF 按 id 存放，内容基本不变：允许浏览器缓存一小时
+    app.mount(
+        "/papers",
+        CachedStaticFiles(directory=settings.PAPER_DATA_DIR, cache_control="public, max-age=3600"),
+        name="papers",
+    )
 if os.path.exists(settings.CUSTOM_TOOLS_DATA_DIR):
-    app.mount("/custom-tools-files", StaticFiles(directory=settings.CUSTOM_TOOLS_DATA_DIR), name="custom-tools-files")
+    # 翻译产物可能在重跑任务时原地覆盖：每次用 ETag 协商，未变化时返回 304
+    app.mount(
+        "/custom-tools-files",
+        CachedStaticFiles(directory=settings.CUSTOM_TOOLS_DATA_DIR, cache_control="no-cache"),
+        name="custom-tools-files",
+    )
 
 
 @app.get("/")
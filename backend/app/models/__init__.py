@@ -1,10 +1,28 @@
-"""模型包初始化"""
-from app.models.base import Base
-from app.models.category import Category
-from app.models.tool import Tool
-from app.models.conversation import Conversation
-from app.models.message import Message
-from app.models.config import Config
+"""模型包初始化（按需导入，首次访问时才加载对应模型模块）"""
+import importlib
+
+_LAZY_MODULES = {
+    "Base": "app.models.base",
+    "Category": "app.models.category",
+    "Tool": "app.models.tool",
+    "Conversation": "app.models.conversation",
+    "Message": "app.models.message",
+    "Config": "app.models.config",
+}
+
+# 这几个模型在 relationship() 里按名字互相引用，必须一起注册，mapper 才能完成配置
+_RELATED_MODELS = ("Category", "Tool", "Conversation", "Message")
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    names = _RELATED_MODELS if name in _RELATED_MODELS else (name,)
+    for model_name in names:
+        module = importlib.import_module(_LAZY_MODULES[model_name])
+        globals()[model_name] = getattr(module, model_name)
+    return globals()[name]
+
 
 __all__ = [
     "Base",
@@ -4,7 +4,7 @@ Review note:
 - 使用 `extra` (TEXT JSON) 保存会话级可扩展状态（如 paper registry / active ids）。
 - 固定列保持精简，后续需求尽量走 `extra`，避免频繁改表。
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -16,15 +16,21 @@ class Conversation(Base):
     __tablename__ = "conversations"
     
     id = Column(String(50), primary_key=True)
-    tool_id = Column(String(50), ForeignKey("tools.id", ondelete="CASCADE"), nullable=True, index=True)
+    tool_id = Column(String(50), ForeignKey("tools.id", ondelete="CASCADE"), nullable=True)
     title = Column(String(200), nullable=False)
     extra = Column(Text, nullable=True, default=None)  # JSON string for extensible conversation state
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # 关系
     tool = relationship("Tool", back_populates="conversations")
     messages = relationship("Message", back_populates="conversation", cascade="all, delete-orphan", order_by="Message.created_at")
     
+    # 索引：会话列表按 updated_at 倒序，按工具筛选时复用 (tool_id, updated_at) 免排序
+    __table_args__ = (
+        Index("ix_conv_updated_desc", updated_at.desc()),
+        Index("ix_conv_tool_updated", tool_id, updated_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<Conversation {self.title}>"
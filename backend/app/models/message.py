@@ -4,7 +4,7 @@ Review note:
 - 使用 `extra` (TEXT JSON) 保存消息级扩展信息（如检索轨迹）。
 - 避免为每个新特性持续加独立列。
 """
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -16,7 +16,7 @@ class Message(Base):
     __tablename__ = "messages"
     
     id = Column(String(50), primary_key=True)
-    conversation_id = Column(String(50), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False, index=True)
+    conversation_id = Column(String(50), ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
     role = Column(String(20), nullable=False)  # user, assistant, system
     content = Column(Text, nullable=False)
     images = Column(Text, nullable=True, default=None)  # JSON array of base64 images
@@ -24,7 +24,7 @@ class Message(Base):
     cost_meta = Column(Text, nullable=True, default=None)  # JSON string for cost metadata
     thinking = Column(Text, nullable=True, default=None)  # Model thinking/reasoning content
     extra = Column(Text, nullable=True, default=None)  # JSON string for extensible message metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # 关系
     conversation = relationship("Conversation", back_populates="messages")
@@ -32,6 +32,8 @@ class Message(Base):
     # 约束
     __table_args__ = (
         CheckConstraint("role IN ('user', 'assistant', 'system')", name="check_role"),
+        # 按会话取消息并按时间排序，一个组合索引即可免排序
+        Index("ix_msg_conv_created", conversation_id, created_at),
     )
     
     def __repr__(self):
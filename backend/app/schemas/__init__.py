@@ -1,36 +1,42 @@
-"""Schemas包初始化"""
-from app.schemas.tool import (
-    CategoryCreate,
-    CategoryUpdate,
-    CategoryResponse,
-    CategoryListResponse,
-    ToolCreate,
-    ToolUpdate,
-    ToolResponse,
-    ToolListResponse,
-    CategoryOrderUpdate,
-    UploadIconResponse,
-)
-from app.schemas.conversation import (
-    ConversationCreate,
-    ConversationUpdate,
-    ConversationResponse,
-    ConversationDetailResponse,
-    ConversationListResponse,
-    MessageResponse,
-    ExportConversationResponse,
-)
-from app.schemas.chat import (
-    ChatRequest,
-    StopChatRequest,
-    APIConfig,
-)
-from app.schemas.config import (
-    APIConfigResponse,
-    APIConfigUpdate,
-    TestConnectionRequest,
-    TestConnectionResponse,
-)
+"""Schemas包初始化（按需导入，首次访问时才加载对应 schema 模块）"""
+import importlib
+
+_LAZY_MODULES = {
+    "CategoryCreate": "app.schemas.tool",
+    "CategoryUpdate": "app.schemas.tool",
+    "CategoryResponse": "app.schemas.tool",
+    "CategoryListResponse": "app.schemas.tool",
+    "ToolCreate": "app.schemas.tool",
+    "ToolUpdate": "app.schemas.tool",
+    "ToolResponse": "app.schemas.tool",
+    "ToolListResponse": "app.schemas.tool",
+    "CategoryOrderUpdate": "app.schemas.tool",
+    "UploadIconResponse": "app.schemas.tool",
+    "ConversationCreate": "app.schemas.conversation",
+    "ConversationUpdate": "app.schemas.conversation",
+    "ConversationResponse": "app.schemas.conversation",
+    "ConversationDetailResponse": "app.schemas.conversation",
+    "ConversationListResponse": "app.schemas.conversation",
+    "MessageResponse": "app.schemas.conversation",
+    "ExportConversationResponse": "app.schemas.conversation",
+    "ChatRequest": "app.schemas.chat",
+    "StopChatRequest": "app.schemas.chat",
+    "APIConfig": "app.schemas.chat",
+    "APIConfigResponse": "app.schemas.config",
+    "APIConfigUpdate": "app.schemas.config",
+    "TestConnectionRequest": "app.schemas.config",
+    "TestConnectionResponse": "app.schemas.config",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Tool schemas
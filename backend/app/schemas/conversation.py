@@ -4,23 +4,49 @@ Review note:
 - `extra` 字段承载可扩展 JSON（会话/消息维度）。
 - 前端按字典读取，不耦合固定子字段。
 """
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, BeforeValidator, Field, ConfigDict
+from typing import Annotated, Any, Literal, Optional, List
 from datetime import datetime
+import json
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _parse_json_text(value: Any, expected: type) -> Any:
+    """ORM 中的 JSON 文本列 -> expected 类型对象；解析失败或类型不符返回 None。"""
+    if isinstance(value, expected):
+        return value
+    if not isinstance(value, (str, bytes)) or not value:
+        return None
+    try:
+        # orjson.JSONDecodeError / json.JSONDecodeError 均为 ValueError 子类
+        parsed = orjson.loads(value) if orjson is not None else json.loads(value)
+    except ValueError:
+        return None
+    return parsed if isinstance(parsed, expected) else None
+
+
+def _parse_json_dict(value: Any) -> Any:
+    return _parse_json_text(value, dict)
+
+
+# 与 messages 表的 check_role 约束一致
+MessageRole = Literal["user", "assistant", "system"]
+
+# TEXT 列里的 JSON 对象（cost_meta / extra），各字段共用一个校验函数
+JsonDict = Annotated[Optional[dict], BeforeValidator(_parse_json_dict)]
 
 
 class MessageBase(BaseModel):
     """消息基础模型"""
-    role: str = Field(..., description="角色: user, assistant, system")
+    role: MessageRole = Field(..., description="角色: user, assistant, system")
     content: str = Field(..., min_length=1, description="消息内容")
     images: Optional[List[str]] = Field(None, description="图片数组（base64编码）")
 
 
-class MessageCreate(MessageBase):
-    """创建消息"""
-    conversation_id: str = Field(..., description="所属会话ID")
-
-
 class MessageResponse(MessageBase):
     """消息响应"""
     model_config = ConfigDict(from_attributes=True)
@@ -29,45 +55,25 @@ class MessageResponse(MessageBase):
     conversation_id: str
     created_at: datetime
     retry_versions: Optional[List[str]] = Field(None, description="重试版本列表（之前的回复）")
-    cost_meta: Optional[dict] = Field(None, description="计费信息")
+    cost_meta: JsonDict = Field(None, description="计费信息")
     thinking: Optional[str] = Field(None, description="模型思考内容")
-    extra: Optional[dict] = Field(None, description="消息扩展元数据")
-    
-    @field_validator("cost_meta", mode="before")
-    @classmethod
-    def parse_cost_meta(cls, v):
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return v
-        if isinstance(v, str):
-            try:
-                import json
-                return json.loads(v)
-            except Exception:
-                return None
-        return None
+    extra: JsonDict = Field(None, description="消息扩展元数据")
 
-    @field_validator("extra", mode="before")
     @classmethod
-    def parse_extra(cls, v):
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return v
-        if isinstance(v, str):
-            try:
-                import json
-                return json.loads(v)
-            except Exception:
-                return None
-        return None
-
-
-class ConversationBase(BaseModel):
-    """会话基础模型"""
-    tool_id: Optional[str] = Field(None, description="关联的工具ID，为空时为通用对话模式")
-    title: str = Field(..., min_length=1, max_length=200, description="会话标题")
+    def from_orm_fast(cls, row: Any) -> "MessageResponse":
+        """由本服务写入的 ORM 行直接构造，跳过字段校验；JSON 文本列在此解析。"""
+        return cls.model_construct(
+            id=row.id,
+            conversation_id=row.conversation_id,
+            role=row.role,
+            content=row.content,
+            images=_parse_json_text(row.images, list),
+            retry_versions=_parse_json_text(row.retry_versions, list),
+            cost_meta=_parse_json_text(row.cost_meta, dict),
+            thinking=row.thinking,
+            extra=_parse_json_text(row.extra, dict),
+            created_at=row.created_at,
+        )
 
 
 class ConversationCreate(BaseModel):
@@ -88,25 +94,23 @@ class ConversationResponse(BaseModel):
     id: str
     tool_id: Optional[str]
     title: str
-    extra: Optional[dict] = Field(None, description="会话扩展元数据")
+    extra: JsonDict = Field(None, description="会话扩展元数据")
     created_at: datetime
     updated_at: datetime
     message_count: int = Field(default=0, description="消息数量")
 
-    @field_validator("extra", mode="before")
     @classmethod
-    def parse_conversation_extra(cls, v):
-        if v is None:
-            return None
-        if isinstance(v, dict):
-            return v
-        if isinstance(v, str):
-            try:
-                import json
-                return json.loads(v)
-            except Exception:
-                return None
-        return None
+    def from_orm_fast(cls, row: Any, message_count: int = 0) -> "ConversationResponse":
+        """由本服务写入的 ORM 行直接构造，跳过字段校验。"""
+        return cls.model_construct(
+            id=row.id,
+            tool_id=row.tool_id,
+            title=row.title,
+            extra=_parse_json_text(row.extra, dict),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            message_count=message_count,
+        )
 
 
 class ConversationDetailResponse(ConversationResponse):
@@ -115,6 +119,21 @@ class ConversationDetailResponse(ConversationResponse):
 
     messages: list[MessageResponse] = Field(default_factory=list)
 
+    @classmethod
+    def from_orm_fast(cls, row: Any, message_count: Optional[int] = None) -> "ConversationDetailResponse":
+        """会话行 + 已加载的 messages 关系，逐条走 MessageResponse.from_orm_fast。"""
+        messages = [MessageResponse.from_orm_fast(msg) for msg in row.messages]
+        return cls.model_construct(
+            id=row.id,
+            tool_id=row.tool_id,
+            title=row.title,
+            extra=_parse_json_text(row.extra, dict),
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            message_count=len(messages) if message_count is None else message_count,
+            messages=messages,
+        )
+
 
 class ConversationListResponse(BaseModel):
     """会话列表响应"""
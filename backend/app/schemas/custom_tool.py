@@ -4,7 +4,12 @@ Review note:
 - 扩展 arxiv-translate 的任务模型（请求、步骤、产物、任务状态）。
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Literal, Optional
+
+
+# 与 arxiv_translate/service.py 中写入的状态取值保持一致
+ArxivTranslateJobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+ArxivTranslateStepStatus = Literal["running", "done", "error"]
 
 
 class DemoCustomToolRequest(BaseModel):
@@ -55,7 +60,7 @@ class ArxivTranslateCreateRequest(BaseModel):
 class ArxivTranslateStep(BaseModel):
     step_id: str
     key: str
-    status: str
+    status: ArxivTranslateStepStatus
     message: str
     at: str
     elapsed_ms: Optional[int] = None
@@ -70,7 +75,7 @@ class ArxivTranslateArtifact(BaseModel):
 
 class ArxivTranslateJobResponse(BaseModel):
     job_id: str
-    status: str
+    status: ArxivTranslateJobStatus
     input_text: str
     paper_id: Optional[str] = None
     canonical_id: Optional[str] = None
@@ -84,7 +89,7 @@ class ArxivTranslateJobResponse(BaseModel):
 
 class ArxivTranslateHistoryItem(BaseModel):
     job_id: str
-    status: str
+    status: ArxivTranslateJobStatus
     input_text: Optional[str] = None
     paper_id: Optional[str] = None
     canonical_id: Optional[str] = None
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 import json
+import os
 
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
 
-@dataclass(frozen=True)
-class PaperPaths:
+
+class PaperPaths(NamedTuple):
     root_dir: Path
     paper_dir: Path
     pdf_path: Path
@@ -20,6 +25,8 @@ class PaperPaths:
     chunk_embeddings_path: Path
 
 
+# Pure and immutable: repeated lookups for the same paper share one instance.
+@lru_cache(maxsize=256)
 def build_paper_paths(base_dir: str, safe_id: str) -> PaperPaths:
     root = Path(base_dir)
     paper_dir = root / safe_id
@@ -40,10 +47,16 @@ def ensure_paper_dir(paths: PaperPaths) -> None:
 
 
 def has_ready_parsed_artifacts(paths: PaperPaths) -> bool:
+    # One directory listing instead of a stat per artifact.
+    try:
+        with os.scandir(paths.paper_dir) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        return False
     return (
-        paths.meta_path.exists()
-        and paths.markdown_path.exists()
-        and paths.chunks_path.exists()
+        paths.meta_path.name in names
+        and paths.markdown_path.name in names
+        and paths.chunks_path.name in names
     )
 
 
@@ -63,22 +76,22 @@ def save_meta(paths: PaperPaths, meta: Dict) -> None:
 
 def save_chunks_jsonl(paths: PaperPaths, chunks: List[Dict]) -> None:
     ensure_paper_dir(paths)
-    with paths.chunks_path.open("w", encoding="utf-8") as f:
-        for chunk in chunks:
-            f.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+    # Encode every line first, then write the file in one call.
+    if orjson is not None:
+        payload = b"".join(orjson.dumps(chunk, option=orjson.OPT_APPEND_NEWLINE) for chunk in chunks)
+    else:
+        payload = "".join(json.dumps(chunk, ensure_ascii=False) + "\n" for chunk in chunks).encode("utf-8")
+    paths.chunks_path.write_bytes(payload)
 
 
 def load_chunks_jsonl(paths: PaperPaths) -> List[Dict]:
-    if not paths.chunks_path.exists():
+    try:
+        raw = paths.chunks_path.read_bytes()
+    except FileNotFoundError:
         return []
-    items: List[Dict] = []
-    with paths.chunks_path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            items.append(json.loads(line))
-    return items
+    # One read, then decode each line from bytes (orjson when available).
+    loads = orjson.loads if orjson is not None else json.loads
+    return [loads(line) for line in raw.splitlines() if line.strip()]
 
 
 def save_chunk_embeddings(paths: PaperPaths, payload: Dict) -> None:
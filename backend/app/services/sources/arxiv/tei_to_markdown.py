@@ -11,7 +11,7 @@ import xml.etree.ElementTree as ET
 TEI_NS = {"tei": "http://www.tei-c.org/ns/1.0"}
 
 
-@dataclass
+@dataclass(slots=True)
 class SectionMeta:
     section_id: str
     level: int
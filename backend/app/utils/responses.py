@@ -0,0 +1,18 @@
+"""响应辅助类"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    直接用 pydantic-core 把模型序列化为 JSON。
+    路由返回该响应时 FastAPI 不再走 response_model 校验与 jsonable_encoder，
+    只适合由可信数据构造的响应模型。
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return super().render(content)
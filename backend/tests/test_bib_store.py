@@ -0,0 +1,28 @@
+"""bib_lookup.bib_store 的标题提取测试。"""
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("bibtexparser")
+
+from app.custom_tools.bib_lookup.bib_store import BibStore  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    ("line", "title"),
+    [
+        ("  title = {Attention Is All You Need},", "Attention Is All You Need"),
+        ('  title = "Attention Is All You Need",', "Attention Is All You Need"),
+        # 贪婪匹配：嵌套花括号保留在标题里，只去掉最外层。
+        ("  title = {{BERT}: Pre-training of Deep Bidirectional Transformers},",
+         "{BERT}: Pre-training of Deep Bidirectional Transformers"),
+        ("  Title={{BERT} and {GPT}}", "{BERT} and {GPT}"),
+    ],
+)
+def test_extract_title(line: str, title: str):
+    entry_lines = ["@inproceedings{key,", "  author = {A. Author},", line, "}"]
+    assert BibStore().extract_title(entry_lines) == title
+
+
+def test_extract_title_missing():
+    assert BibStore().extract_title(["@misc{key,", "  year = {2020},", "}"]) == ""
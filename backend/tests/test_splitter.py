@@ -0,0 +1,19 @@
+"""arxiv_translate.splitter 的保留区域测试。"""
+from __future__ import annotations
+
+from app.custom_tools.arxiv_translate.splitter import _build_translation_mask
+
+
+def test_crossing_begin_end_regions_are_preserved():
+    # equation 块与 figure 块交叉：两段各自保留，合起来覆盖整串。
+    text = "\\begin{equation}\\begin{figure}\\end{equation}{\\end{figure}"
+    assert not _build_translation_mask(text).any()
+
+
+def test_iffalse_opening_figure_is_preserved():
+    # \iffalse ... \fi 里开始的 figure 跨过 \fi 才结束；超过 42 行，短块规则管不到。
+    body = "caption text\n" * 50
+    text = "\\iffalse \\begin{figure}\\fi " + body + "\\end{figure} tail"
+    mask = _build_translation_mask(text)
+    assert not mask[: text.index(" tail")].any()
+    assert mask[text.index(" tail") :].all()